@@ -2,14 +2,12 @@
 import tkinter as tk
 from tkinter import font as tkFont, messagebox
 from PIL import Image, ImageTk
-from datetime import datetime
-import sqlite3
-import hashlib
 import os
 import chatbot # Your existing chatbot logic module
 import threading
-import pyttsx3
 import time
+from helpers.tts_helpers import TTSWorker
+from helpers import metrics, profiling, memory_helpers, image_helpers, history_retention
 
 # Add ffmpeg path manually for soundfile/whisper to find it
 os.environ["PATH"] += os.pathsep + r"C:\ffmpeg\bin"
@@ -18,9 +16,8 @@ os.environ["PATH"] += os.pathsep + r"C:\ffmpeg\bin"
 try:
     import whisper
     import sounddevice as sd
-    import soundfile as sf
     import numpy as np
-    import tempfile
+    from helpers.speech_helpers import TranscriptionService, VoiceCapture, microphone_chunks, run_capture
     STT_ENABLED = True
 except ImportError as e:
     print(f"Speech-to-Text dependencies not found: {e}. STT will be disabled.")
@@ -29,7 +26,15 @@ except ImportError as e:
 # ===================================================================================
 # 2. CONFIGURATION AND PATH HELPER
 # ===================================================================================
-RECORD_SECONDS = 7  # Duration of the audio recording in seconds
+MAX_RECORD_SECONDS = 15  # Upper bound on one voice query; recording normally stops at end-of-speech
+# Speech model size/backend: set MEDIBOT_WHISPER_MODEL (e.g. tiny.en) and
+# MEDIBOT_STT_BACKEND=faster-whisper for int8 CPU inference
+
+# Build the page users most likely open next while the app is idle (MEDIBOT_PREWARM=0 disables)
+PREWARM_PAGES = os.environ.get("MEDIBOT_PREWARM", "1") != "0"
+NEXT_PAGE = {"HomePage": "MenuPage", "MenuPage": "LoginPage", "LoginPage": "ChatbotApp", "RegisterPage": "LoginPage"}
+# '/profile' and '/memory' chat commands for developers (MEDIBOT_DEBUG_COMMANDS=1 enables); off for end users
+DEBUG_COMMANDS = os.environ.get("MEDIBOT_DEBUG_COMMANDS", "0") == "1"
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_PATH = os.path.join(BASE_DIR, 'assets')
@@ -39,170 +44,108 @@ def resource_path(relative_path):
     return os.path.join(ASSETS_PATH, relative_path)
 
 # ===================================================================================
-# 3. DATABASE HELPER (Unchanged)
+# 3. DATABASE HELPER (see helpers/db_helpers.py)
 # ===================================================================================
-class Database:
-    def __init__(self, db_name="medical_chatbot.db"):
-        self.db_name = os.path.join(BASE_DIR, db_name)
-        self._check_and_recreate_db_if_needed()
-        self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
-        self.cursor = self.conn.cursor()
-        self.create_tables()
-
-    def _check_and_recreate_db_if_needed(self):
-        if not os.path.exists(self.db_name): return
-        try:
-            with sqlite3.connect(self.db_name) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1 FROM User LIMIT 1")
-                cursor.execute("SELECT 1 FROM ChatHistory LIMIT 1")
-        except sqlite3.OperationalError as e:
-            print(f"Database schema error: {e}. Backing up and recreating database.")
-            backup_name = self.db_name + f".backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            os.rename(self.db_name, backup_name)
-            print(f"Backed up corrupt database to {backup_name}")
-
-    def create_tables(self):
-        self.cursor.execute('''CREATE TABLE IF NOT EXISTS User (id INTEGER PRIMARY KEY, username TEXT UNIQUE NOT NULL, email TEXT UNIQUE NOT NULL, password TEXT NOT NULL)''')
-        self.cursor.execute('''CREATE TABLE IF NOT EXISTS ChatHistory (id INTEGER PRIMARY KEY, user_id INTEGER, message_text TEXT, sender_type TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (user_id) REFERENCES User(id))''')
-        self.cursor.execute('''CREATE TABLE IF NOT EXISTS Prediction (id INTEGER PRIMARY KEY, user_id INTEGER, symptoms TEXT, predicted_disease TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (user_id) REFERENCES User(id))''')
-        self.conn.commit()
-
-    def hash_password(self, password): return hashlib.sha256(password.encode()).hexdigest()
-    def add_user(self, username, email, password):
-        try:
-            self.cursor.execute("INSERT INTO User (username, email, password) VALUES (?, ?, ?)", (username, email, self.hash_password(password)))
-            self.conn.commit(); return True
-        except sqlite3.IntegrityError: return False
-    def check_user(self, username, password):
-        self.cursor.execute("SELECT id, username, email FROM User WHERE username = ? AND password = ?", (username, self.hash_password(password)))
-        return self.cursor.fetchone()
-    def update_password(self, email, new_password):
-        self.cursor.execute("UPDATE User SET password = ? WHERE email = ?", (self.hash_password(new_password), email))
-        self.conn.commit(); return self.cursor.rowcount > 0
-    def add_chat_message(self, user_id, message, sender):
-        self.cursor.execute("INSERT INTO ChatHistory (user_id, message_text, sender_type) VALUES (?, ?, ?)", (user_id, message, sender))
-        self.conn.commit()
-    def get_chat_history(self, user_id):
-        self.cursor.execute("SELECT message_text, sender_type FROM ChatHistory WHERE user_id = ? ORDER BY timestamp ASC", (user_id,))
-        return self.cursor.fetchall()
-    def clear_user_history(self, user_id):
-        self.cursor.execute("DELETE FROM ChatHistory WHERE user_id = ?", (user_id,)); self.conn.commit()
+from helpers.db_helpers import Database
 
 # ===================================================================================
 # 4. SPEECH AND AUDIO HANDLERS
 # ===================================================================================
+WELCOME_MESSAGE = "👋 Hello! I'm your medical assistant."
+HISTORY_CLEARED_MESSAGE = "Chat history cleared. How can I help you now?"
+
 class TTSHandler:
+    """Thin wrapper over the TTS worker thread; speak_text returns immediately."""
     def __init__(self):
-        try:
-            self.engine = pyttsx3.init(driverName='sapi5')
-            self.engine.setProperty('rate', 150); self.engine.setProperty('volume', 0.9)
-        except Exception as e:
-            print(f"Error initializing TTS engine: {e}. TTS will be disabled."); self.engine = None
+        self.worker = TTSWorker()
+        # Fixed replies are rendered once into the audio cache so they play instantly
+        self.worker.prerender(chatbot.CANNED_RESPONSES + [WELCOME_MESSAGE, HISTORY_CLEARED_MESSAGE])
     def speak_text(self, text, on_finish_callback=None):
-        if not self.engine:
-            if on_finish_callback: on_finish_callback(); return
-        try: self.engine.say(text); self.engine.runAndWait()
-        except Exception as e: print(f"Text-to-speech error: {e}")
-        finally:
-            if on_finish_callback: on_finish_callback()
+        self.worker.speak(text, on_finish_callback)
     def stop_speaking(self):
-        if self.engine: self.engine.stop()
+        self.worker.stop()
 
 class SpeechRecognitionHandler:
-    """Handles STT using a fixed-duration recording for maximum reliability."""
-    def __init__(self, controller, model_size="base.en"):
+    """Handles STT with VAD-endpointed streaming capture and a persistent, preloaded transcription worker."""
+    def __init__(self, controller, model_size=None):
         self.controller = controller
-        self.model = None
-        self.model_size = model_size
-        self.is_loading_model = False
+        self.service = TranscriptionService(model_size=model_size) if model_size else TranscriptionService()
         self.is_recording = False # Use a new flag to prevent multiple clicks
 
-    def _load_model(self, on_load_callback):
-        self.is_loading_model = True
-        print(f"Loading Whisper model '{self.model_size}' for the first time...")
-        try:
-            self.model = whisper.load_model(self.model_size)
-            print("Whisper model loaded successfully.")
-        except Exception as e:
-            self.model = None
-            self.controller.after(0, lambda: messagebox.showerror("Whisper Error", f"Could not load speech model: {e}\n\nPlease ensure FFmpeg is installed."))
-        finally:
-            self.is_loading_model = False
-            self.controller.after(0, on_load_callback)
-
-    def start_recording_session(self, on_transcription_result, on_state_change):
-        if not STT_ENABLED or self.is_loading_model or self.is_recording:
-            return
+    def preload(self):
+        """Load the model in the background so the first utterance is as fast as later ones."""
+        self.service.preload(on_ready=self._on_model_ready)
 
-        if self.model is None:
-            on_state_change("loading_model")
-            threading.Thread(target=self._load_model, args=(lambda: self.start_recording_session(on_transcription_result, on_state_change),), daemon=True).start()
+    def _on_model_ready(self, error):
+        if error:
+            self.controller.after(0, lambda err=error: messagebox.showerror("Whisper Error", f"Could not load speech model: {err}\n\nPlease ensure FFmpeg is installed."))
+
+    def start_recording_session(self, on_transcription_result, on_state_change, on_partial_result=None):
+        if not STT_ENABLED or self.is_recording:
             return
 
+        # Recording can start while the model is still loading; the transcription
+        # job simply queues behind the load on the worker thread.
         self.is_recording = True
         on_state_change("listening")
-        threading.Thread(target=self._record_and_transcribe, args=(on_transcription_result, on_state_change), daemon=True).start()
-
-    def _record_and_transcribe(self, on_transcription_result, on_state_change):
-        """Records for a fixed duration and then transcribes."""
-        samplerate = 16000
-        try:
-            print(f"🎙️ Recording for {RECORD_SECONDS} seconds...")
-            # This is the reliable, blocking recording method
-            audio_data = sd.rec(int(RECORD_SECONDS * samplerate), samplerate=samplerate, channels=1, dtype='float32')
-            sd.wait() # Wait for the recording to complete
-            
-            print("Recording finished. Processing...")
-            self.controller.after(0, on_state_change, "processing")
-
-        except Exception as e:
-            print(f"Audio recording error: {e}")
-            self.controller.after(0, lambda: messagebox.showerror("Audio Error", f"Could not start recording: {e}\nPlease check your microphone."))
+        threading.Thread(target=self._record_and_transcribe, args=(on_transcription_result, on_state_change, on_partial_result), daemon=True).start()
+
+    def _record_and_transcribe(self, on_transcription_result, on_state_change, on_partial_result=None):
+        """Streams microphone audio until end-of-speech, showing partial text while the user talks."""
+        def on_result(transcribed_text, error):
+            if error:
+                print(f"Transcription failed: {error}")
+            else:
+                print(f"Transcription: {transcribed_text}")
+            self.controller.after(0, on_transcription_result, transcribed_text)
             self.controller.after(0, on_state_change, "idle")
-            self.is_recording = False
-            return
+            self.is_recording = False # Allow new recordings
 
-        # Create, close, and then write to a temporary file
-        temp_file_handle = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        temp_audio_file = temp_file_handle.name
-        temp_file_handle.close()
+        def on_partial(text):
+            if on_partial_result: self.controller.after(0, on_partial_result, text)
+
+        def on_speech_end():
+            print("Recording finished. Processing...")
+            self.controller.after(0, on_state_change, "processing" if self.service.ready.is_set() else "loading_model")
 
+        capture = VoiceCapture(self.service, on_final=on_result, on_partial=on_partial, on_speech_end=on_speech_end, max_seconds=MAX_RECORD_SECONDS)
         try:
-            sf.write(temp_audio_file, audio_data, samplerate)
-            
-            result = self.model.transcribe(temp_audio_file)
-            transcribed_text = result['text']
-            print(f"Transcription: {transcribed_text}")
-            self.controller.after(0, on_transcription_result, transcribed_text)
+            print("🎙️ Listening...")
+            run_capture(capture, microphone_chunks())
         except Exception as e:
-            print(f"Transcription failed: {e}")
-            self.controller.after(0, on_transcription_result, "")
-        finally:
-            self.controller.after(0, on_state_change, "idle")
-            self.is_recording = False # Allow new recordings
-            if os.path.exists(temp_audio_file):
-                os.remove(temp_audio_file)
+            print(f"Audio recording error: {e}")
+            self.controller.after(0, lambda err=e: messagebox.showerror("Audio Error", f"Could not start recording: {err}\nPlease check your microphone."))
+            if not capture.done:
+                self.controller.after(0, on_state_change, "idle")
+                self.is_recording = False
 
 # ===================================================================================
 # 5. UI HELPER CLASSES (Unchanged)
 # ===================================================================================
+RESIZE_DEBOUNCE_MS = 80  # a window drag fires <Configure> for every pixel; render once it settles
+
 class ResponsiveBgFrame(tk.Frame):
     def __init__(self, parent, controller, image_path):
         tk.Frame.__init__(self, parent)
         self.controller = controller
-        try:
-            self.original_image = Image.open(resource_path(image_path))
-        except Exception:
-            print(f"Image not found: {image_path}. Using fallback background.")
-            self.original_image = Image.new("RGB", (1, 1), color="#EAEAF2")
+        self.image_path = resource_path(image_path)
+        self.bg_photo = None; self._rendered_size = None; self._resize_job = None
         self.bg_label = tk.Label(self); self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-        self.bind("<Configure>", self._resize_image)
-
-    def _resize_image(self, event):
-        resized = self.original_image.resize((event.width, event.height), Image.Resampling.LANCZOS)
-        self.bg_photo = ImageTk.PhotoImage(resized)
-        self.bg_label.configure(image=self.bg_photo)
+        self.bind("<Configure>", self._schedule_resize)
+        controller.register_background(self)
+
+    def _schedule_resize(self, event):
+        if self._resize_job is not None: self.after_cancel(self._resize_job)
+        self._resize_job = self.after(RESIZE_DEBOUNCE_MS, self.refresh_background)
+
+    def refresh_background(self):
+        """Scale the background to the current size; hidden pages wait until they are shown."""
+        self._resize_job = None
+        if not self.controller.is_visible(self): return
+        size = (self.winfo_width(), self.winfo_height())
+        if size == self._rendered_size or min(size) < 2: return
+        self.bg_photo = ImageTk.PhotoImage(image_helpers.scaled_image(self.image_path, *size))
+        self.bg_label.configure(image=self.bg_photo); self._rendered_size = size
 
 class ModernMenuButton(tk.Frame):
     def __init__(self, parent, text, icon, command):
@@ -223,27 +166,53 @@ class MainApp(tk.Tk):
     def __init__(self, *args, **kwargs):
         tk.Tk.__init__(self, *args, **kwargs)
         self.db = Database(); self.speech_handler = TTSHandler()
+        threading.Thread(target=history_retention.maintain_in_background, args=(self.db.db_name,), name="history-maintenance", daemon=True).start()
         self.speech_recognizer = SpeechRecognitionHandler(self) if STT_ENABLED else None
         self.current_user_id = None; self.current_username = None
+        self.current_page = None; self._backgrounds = []
         self.title("Medicine Information and Advice System"); self.geometry("1200x750"); self.minsize(1000, 700)
-        container = tk.Frame(self); container.pack(side="top", fill="both", expand=True)
-        container.grid_rowconfigure(0, weight=1); container.grid_columnconfigure(0, weight=1)
-        self.frames = {}
+        self.container = tk.Frame(self); self.container.pack(side="top", fill="both", expand=True)
+        self.container.grid_rowconfigure(0, weight=1); self.container.grid_columnconfigure(0, weight=1)
+        # Pages are built (and their backgrounds decoded) the first time they are needed
         pages = (HomePage, MenuPage, LoginPage, RegisterPage, ForgotPasswordPage, ChatbotApp, AbstractPage, AlgorithmPage, ExamplePage, DatasetPage, HelpPage)
-        for F in pages:
-            frame = F(parent=container, controller=self)
-            self.frames[F.__name__] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.page_classes = {F.__name__: F for F in pages}
+        self.frames = {}
         self.show_frame("HomePage")
+    def get_frame(self, page_name):
+        frame = self.frames.get(page_name)
+        if frame is None:
+            frame = self.page_classes[page_name](parent=self.container, controller=self)
+            self.frames[page_name] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+            if self.current_page is not None and frame is not self.current_page: frame.lower(self.current_page)
+        return frame
     def show_frame(self, page_name):
-        frame = self.frames[page_name]
         if page_name == 'ChatbotApp' and not self.current_user_id:
             messagebox.showwarning("Login Required", "You must be logged in."); self.show_frame("LoginPage"); return
+        frame = self.get_frame(page_name)
         if hasattr(frame, 'on_show'): frame.on_show()
-        frame.tkraise()
+        frame.tkraise(); self.current_page = frame
+        for bg in self._backgrounds:
+            if self.is_visible(bg): bg.refresh_background()
+        if PREWARM_PAGES and page_name in NEXT_PAGE: self.after_idle(self._prewarm, NEXT_PAGE[page_name])
+    def _prewarm(self, page_name):
+        """Build a hidden page and pre-scale its background to the current window size."""
+        frame = self.get_frame(page_name)
+        width, height = self.container.winfo_width(), self.container.winfo_height()
+        for bg in self._backgrounds:
+            if min(width, height) > 1 and self._page_of(bg) is frame: image_helpers.scaled_image(bg.image_path, width, height)
+    def register_background(self, bg): self._backgrounds.append(bg)
+    def _page_of(self, widget):
+        while widget is not None and widget.master is not self.container: widget = widget.master
+        return widget
+    def is_visible(self, widget):
+        """True if widget belongs to the page currently raised."""
+        return self.current_page is not None and self._page_of(widget) is self.current_page
     def logout(self):
+        chatbot.end_session(self.current_user_id)
         self.current_user_id = None; self.current_username = None
-        self.frames["ChatbotApp"].clear_chat(show_confirmation=False); self.show_frame("LoginPage")
+        if "ChatbotApp" in self.frames: self.frames["ChatbotApp"].clear_chat(show_confirmation=False)
+        self.show_frame("LoginPage")
 
 class ImageContentPage(tk.Frame):
     def __init__(self, parent, controller, image_file):
@@ -382,6 +351,8 @@ class LoginPage(AuthPage):
         user_data = self.controller.db.check_user(username, password)
         if user_data:
             self.controller.current_user_id, self.controller.current_username = user_data[0], user_data[1]
+            if self.controller.speech_recognizer: self.controller.speech_recognizer.preload()
+            threading.Thread(target=chatbot.warm_up, name="chatbot-warm-up", daemon=True).start()
             self.controller.show_frame("ChatbotApp")
         else:
             messagebox.showerror("Login Failed", "Invalid username or password.")
@@ -490,20 +461,21 @@ class ChatbotApp(tk.Frame):
         self.entry = tk.Entry(self.input_canvas, font=("Segoe UI", 12), relief="flat", bd=0); self.entry.bind("<Return>", self._send_message)
         self.send_button = tk.Button(self.input_canvas, text="➤", font=("Segoe UI", 16), relief="flat", bd=0, cursor="hand2", command=self._send_message); self.input_canvas.bind("<Configure>", self._on_input_canvas_resize)
     def _start_listening_session(self):
-        if self.controller.speech_recognizer: self.controller.speech_recognizer.start_recording_session(self._on_transcription_result, self._on_listening_state_change)
+        if self.controller.speech_recognizer: self.controller.speech_recognizer.start_recording_session(self._on_transcription_result, self._on_listening_state_change, self._on_partial_transcription)
     def _on_listening_state_change(self, state):
-        entry_text = {"loading_model": "Loading speech model...", "listening": f"Listening for {RECORD_SECONDS} sec...", "processing": "Processing audio..."}.get(state)
+        entry_text = {"loading_model": "Loading speech model...", "listening": "Listening... (pause to finish)", "processing": "Processing audio..."}.get(state)
         mic_text = {"loading_model": "⏳", "listening": "...", "processing": "🤔", "idle": "🎤"}.get(state)
         is_disabled = state in ["loading_model", "listening", "processing"]
         self.mic_button.config(text=mic_text, state=tk.DISABLED if is_disabled else tk.NORMAL)
         if entry_text: self.entry.delete(0, tk.END); self.entry.insert(0, entry_text)
         elif state == "idle" and "..." in self.entry.get(): self.entry.delete(0, tk.END)
     def _on_transcription_result(self, text): self.entry.delete(0, tk.END); self.entry.insert(0, text)
+    def _on_partial_transcription(self, text): self.entry.delete(0, tk.END); self.entry.insert(0, text + "...")  # "..." blocks sending until final
     def _load_user_data(self):
         self._clear_chat_display()
         for msg, sender in self.controller.db.get_chat_history(self.controller.current_user_id): self.add_message(msg, sender, save_to_db=False)
         self.canvas.yview_moveto(1.0)
-        if not self.scrollable_frame.winfo_children(): self.add_message("👋 Hello! I'm your medical assistant.", "bot", save_to_db=False)
+        if not self.scrollable_frame.winfo_children(): self.add_message(WELCOME_MESSAGE, "bot", save_to_db=False)
     def _clear_chat_display(self): [w.destroy() for w in self.scrollable_frame.winfo_children()]
     def _on_input_canvas_resize(self, event=None):
         self.update_idletasks(); w, h = self.input_canvas.winfo_width(), self.input_canvas.winfo_height()
@@ -547,6 +519,8 @@ class ChatbotApp(tk.Frame):
     def _send_message(self, event=None):
         user_input = self.entry.get().strip()
         if not user_input or "..." in user_input: return
+        if DEBUG_COMMANDS and user_input.startswith("/profile"): self._start_profiling(user_input); return
+        if DEBUG_COMMANDS and user_input == "/memory": self._show_memory_report(); return
         self.add_message(user_input, "user"); self.entry.delete(0, tk.END)
         self.typing_indicator = self.add_message("HealthBot is typing...", "bot", is_typing=True, save_to_db=False)
         threading.Thread(target=self._get_and_display_bot_response, args=(user_input,), daemon=True).start()
@@ -558,13 +532,28 @@ class ChatbotApp(tk.Frame):
             self.typing_indicator.destroy(); self.typing_indicator = None
         self.add_message(response, "bot")
         if self.is_speaking: self.toggle_speaking(speak_now=True)
-    def start_new_chat(self): self._clear_chat_display(); self.add_message("👋 Hello! I'm your medical assistant.", "bot", save_to_db=False)
+    def _start_profiling(self, command):
+        """Debug command: '/profile [seconds]' captures cProfile, stack samples and allocations."""
+        parts = command.split()
+        seconds = float(parts[1]) if len(parts) > 1 and parts[1].replace(".", "", 1).isdigit() else 30
+        session = profiling.start_profiling(seconds)
+        self.entry.delete(0, tk.END)
+        self.add_message(f"🔬 Profiling for {session.duration:.0f}s. Results: {session.out_dir}", "bot", save_to_db=False)
+    def _show_memory_report(self):
+        """Debug command: '/memory' shows RSS and the size of each loaded dataset/model."""
+        self.entry.delete(0, tk.END)
+        self.add_message(memory_helpers.format_report(), "bot", save_to_db=False)
+    def start_new_chat(self):
+        chatbot.end_session(self.controller.current_user_id)
+        self._clear_chat_display(); self.add_message(WELCOME_MESSAGE, "bot", save_to_db=False)
     def clear_chat(self, show_confirmation=True):
         if show_confirmation and not messagebox.askyesno("Confirm", "Delete chat history? This cannot be undone."): return
         self._clear_chat_display()
-        if self.controller.current_user_id: self.controller.db.clear_user_history(self.controller.current_user_id)
+        if self.controller.current_user_id:
+            self.controller.db.clear_user_history(self.controller.current_user_id)
+            threading.Thread(target=history_retention.forget_user, args=(self.controller.current_user_id,), daemon=True).start()
         if show_confirmation: messagebox.showinfo("Success", "Chat history cleared.")
-        self.add_message("Chat history cleared. How can I help you now?", "bot", save_to_db=False)
+        self.add_message(HISTORY_CLEARED_MESSAGE, "bot", save_to_db=False)
     def _update_speaker_buttons_state(self): self.sidebar_speak_button.config(text="⏹️ Stop Speaking" if self.is_speaking else "🔊 Speak Response")
     def _reset_speaker_ui(self): self.is_speaking = False; self._update_speaker_buttons_state()
     def toggle_speaking(self, speak_now=False):
@@ -576,7 +565,7 @@ class ChatbotApp(tk.Frame):
                 last_bot_message = widget.winfo_children()[1].winfo_children()[0].cget("text"); break
         if last_bot_message and "typing" not in last_bot_message:
             self.is_speaking = True; self._update_speaker_buttons_state()
-            threading.Thread(target=self.controller.speech_handler.speak_text, args=(last_bot_message, self._reset_speaker_ui), daemon=True).start()
+            self.controller.speech_handler.speak_text(last_bot_message, lambda: self.after(0, self._reset_speaker_ui))
         elif not speak_now: self._reset_speaker_ui()
 
 # ===================================================================================
@@ -586,7 +575,10 @@ if __name__ == "__main__":
     if not os.path.exists(ASSETS_PATH):
         os.makedirs(ASSETS_PATH)
         print("="*60 + "\nIMPORTANT: 'assets' directory created.\n" + f"Please place your image files inside: {ASSETS_PATH}\n" + "e.g., 'AI_in_Medicine.png', 'abstract.png', etc.\n" + "="*60)
+    if metrics.METRICS_PORT: metrics.serve_metrics(metrics.METRICS_PORT)
+    profiling.start_from_env()
     try: app = MainApp(); app.mainloop()
     except Exception as e:
         messagebox.showerror("Application Error", f"A fatal error occurred: {e}")
-        print(f"Application error: {e}")
\ No newline at end of file
+        print(f"Application error: {e}")
+    finally: profiling.stop_profiling()  # write out a window still open when the app closes
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Rebuild the prediction analytics tables (PredictionSymptom and the daily /
+per-user rollups) from every row already in Prediction. New predictions keep
+them up to date through insert_prediction; run this once on an existing
+database, or again if the rollups ever drift. Stored symptom text is mapped
+to the model's symptom names with predict_helpers.match_symptoms, the same
+way live predictions are counted.
+
+Usage:
+  python backfill_analytics.py
+  python backfill_analytics.py --db medical_chatbot.db --report
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from helpers import db_helpers as db
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def match_symptoms_quietly(symptoms):
+    """match_symptoms without its per-symptom 'Interpreting ...' prints."""
+    from helpers import predict_helpers as ph
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ph.match_symptoms(symptoms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=db.DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Prediction rows read per batch")
+    parser.add_argument("--report", action="store_true", help="Print this week's top diseases and symptoms afterwards")
+    args = parser.parse_args()
+    args.db = os.path.abspath(args.db)
+    os.chdir(BASE_DIR)  # predict_helpers loads model/ and data/ relative to the repo root
+
+    start = time.perf_counter()
+    count = db.backfill_analytics(args.db, args.batch_size, canonicalize=match_symptoms_quietly)
+    print(f"✅ {count} predictions backfilled in {time.perf_counter() - start:.2f}s -> {args.db}")
+
+    if args.report:
+        print("🩺 Most predicted diseases (7 days):")
+        for disease, n in db.top_diseases(days=7, db_path=args.db):
+            print(f"  {n:>6}  {disease}")
+        print("🤒 Most reported symptoms (7 days):")
+        for symptom, n in db.top_symptoms(days=7, db_path=args.db):
+            print(f"  {n:>6}  {symptom}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Run chatbot queries headlessly: JSONL in, JSONL out, in input order.
+
+Each input line is either a JSON object with a "query" field (plus optional
+"id" and "user_id") or a bare JSON string. Each output line carries the
+id (or input line number), query, response, latency and any error. Models are
+loaded once per worker process. Progress goes to stderr, results to stdout
+or --output.
+
+Sessions and follow-ups are per process, so multi-turn conversations that
+rely on them need --workers 1.
+
+Usage:
+  python batch_cli.py queries.jsonl > answers.jsonl
+  cat queries.jsonl | python batch_cli.py --workers 4 --output answers.jsonl
+  python batch_cli.py benchmarks/corpus.jsonl --workers 0   # in-process
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_chatbot = None
+
+
+def _init_worker():
+    """Load the pipeline once; anything the helpers print goes to stderr, not the results."""
+    global _chatbot
+    os.chdir(BASE_DIR)  # helpers load data/ and model/ relative to the repo root
+    sys.stdout = sys.stderr
+    import chatbot
+    _chatbot = chatbot
+
+
+def parse_line(line_no, line):
+    """(id, query, user_id) for one input line; raises ValueError if unusable."""
+    item = json.loads(line)
+    if isinstance(item, str):
+        return line_no, item, None
+    if not isinstance(item, dict) or not isinstance(item.get("query"), str):
+        raise ValueError('expected a JSON string or an object with a "query" string')
+    return item.get("id", line_no), item["query"], item.get("user_id")
+
+
+def run_one(job):
+    line_no, line = job
+    result = {"id": line_no, "query": None, "response": None, "ms": 0.0, "error": None}
+    try:
+        result["id"], result["query"], user_id = parse_line(line_no, line)
+        start = time.perf_counter()
+        result["response"] = _chatbot.get_bot_response(result["query"], user_id)
+        result["ms"] = round((time.perf_counter() - start) * 1000, 3)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def read_jobs(stream):
+    for line_no, line in enumerate(stream, 1):
+        if line.strip():
+            yield line_no, line
+
+
+def percentile(data, q):
+    data = sorted(data)
+    return data[min(len(data) - 1, int(len(data) * q / 100))] if data else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file, or - for stdin")
+    parser.add_argument("--output", "-o", default="-", help="JSONL file, or - for stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes (0 = run in this process)")
+    parser.add_argument("--chunksize", type=int, default=8, help="Queries handed to a worker at a time")
+    parser.add_argument("--progress-every", type=float, default=2.0, help="Seconds between progress lines")
+    args = parser.parse_args()
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+
+    # Load once here first: a worker whose initializer raises is respawned by
+    # Pool forever, so a broken pipeline must fail before any pool exists.
+    # Forked workers then find chatbot already imported.
+    load_start = time.perf_counter()
+    try:
+        _init_worker()
+    except Exception as e:
+        print(f"❌ Could not load the chatbot pipeline: {type(e).__name__}: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"⚙️ Pipeline loaded in {time.perf_counter() - load_start:.1f}s", file=sys.stderr)
+
+    if args.workers > 0:
+        pool = multiprocessing.Pool(args.workers, initializer=_init_worker)
+        results = pool.imap(run_one, read_jobs(source), chunksize=args.chunksize)
+    else:
+        pool = None
+        results = map(run_one, read_jobs(source))
+
+    done = errors = 0
+    latencies = []
+    start = last_report = time.perf_counter()
+    try:
+        for result in results:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            done += 1
+            if result["error"]:
+                errors += 1
+            else:
+                latencies.append(result["ms"])
+            now = time.perf_counter()
+            if now - last_report >= args.progress_every:
+                out.flush()
+                print(f"  {done} done, {errors} errors, {done / (now - start):.1f} q/s", file=sys.stderr)
+                last_report = now
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if args.output != "-":
+            out.close()
+        if args.input != "-":
+            source.close()
+
+    wall = time.perf_counter() - start
+    print(f"✅ {done} queries in {wall:.2f}s ({done / wall if wall else 0:.1f} q/s), {errors} errors, "
+          f"p50 {percentile(latencies, 50):.1f}ms p95 {percentile(latencies, 95):.1f}ms", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
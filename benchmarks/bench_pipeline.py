@@ -0,0 +1,186 @@
+"""
+End-to-end and per-helper latency benchmark over a replayable query corpus.
+
+Usage:
+  python benchmarks/bench_pipeline.py                          # corpus through get_bot_response
+  python benchmarks/bench_pipeline.py --target helpers         # each helper on its own
+  python benchmarks/bench_pipeline.py --replay-db medical_chatbot.db
+  python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+  python benchmarks/bench_pipeline.py --compare benchmarks/baseline.json --tolerance 0.25
+
+--compare exits with status 1 if any p95 got slower than baseline * (1 + tolerance).
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # helpers load data/ and model/ relative to the repo root
+
+DEFAULT_CORPUS = os.path.join("benchmarks", "corpus.jsonl")
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_replay(db_path, limit=None):
+    """User messages from ChatHistory, in the order they were sent."""
+    conn = sqlite3.connect(db_path)
+    try:
+        sql = ("SELECT message_text FROM ChatHistory WHERE lower(sender_type) = 'user' "
+               "ORDER BY timestamp, rowid")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+    return [{"category": "replay", "query": text} for (text,) in rows if text]
+
+
+def percentile(data, q):
+    data = sorted(data)
+    return data[min(len(data) - 1, int(len(data) * q / 100))] if data else 0.0
+
+
+def summarize(timings):
+    result = {}
+    for name, samples in sorted(timings.items()):
+        total = sum(samples)
+        result[name] = {
+            "count": len(samples),
+            "throughput_qps": round(len(samples) / total, 2) if total else 0.0,
+            "mean_ms": round(statistics.mean(samples) * 1000, 3),
+            "p50_ms": round(percentile(samples, 50) * 1000, 3),
+            "p95_ms": round(percentile(samples, 95) * 1000, 3),
+            "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        }
+    return result
+
+
+def bench_pipeline(corpus, repeats):
+    import chatbot
+    timings = defaultdict(list)
+    for _ in range(repeats):
+        for item in corpus:
+            start = time.perf_counter()
+            chatbot.get_bot_response(item["query"])
+            elapsed = time.perf_counter() - start
+            timings[item["category"]].append(elapsed)
+            timings["ALL"].append(elapsed)
+    return timings
+
+
+def helper_calls():
+    """(name, applies_to_categories or None for all, fn(query))"""
+    import chatbot
+    from helpers import example_medicine_helper as emh
+    from helpers import medicine_helpers as mh
+    from helpers import nlp_helpers as nlp
+    from helpers import predict_helpers as ph
+    from helpers import query_parser as qp
+    from helpers import symptom_index as si
+
+    medicine = {"medicine_field", "medicine_info", "misspelled", "alternative"}
+    symptoms = {"symptoms"}
+
+    def split_symptoms(query):
+        return [s.strip().lower() for s in query.split(",") if s.strip()]
+
+    return [
+        ("classify_intent", None, chatbot.classify_intent),
+        ("parse_query", medicine, qp.parse_query),
+        ("find_best_match", medicine - {"alternative"}, chatbot.find_best_match),
+        ("search_medicine", medicine - {"alternative"}, lambda q: mh.search_medicine(q, qp.parse_query(q).info_type)),
+        ("find_alternative_medicines", {"alternative"}, lambda q: emh.find_alternative_medicines(qp.parse_query(q).medicine_name)),
+        ("find_exact_substitutes", {"alternative"}, lambda q: mh.find_exact_substitutes(chatbot.find_best_match(q))),
+        ("extract_symptoms", symptoms, nlp.extract_symptoms),
+        ("predict_top_diseases", symptoms, lambda q: ph.predict_top_diseases(split_symptoms(q))),
+        ("suggest_followups", symptoms, lambda q: si.suggest_followups(ph.match_symptoms(split_symptoms(q)))),
+    ]
+
+
+def bench_helpers(corpus, repeats):
+    timings = defaultdict(list)
+    for name, categories, fn in helper_calls():
+        for _ in range(repeats):
+            for item in corpus:
+                if categories is not None and item["category"] not in categories and item["category"] != "replay":
+                    continue
+                start = time.perf_counter()
+                try:
+                    fn(item["query"])
+                except Exception as e:
+                    print(f"⚠️ {name} failed on {item['query']!r}: {e}")
+                    continue
+                timings[name].append(time.perf_counter() - start)
+    return timings
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("p95_ms"):
+            continue
+        limit = base["p95_ms"] * (1 + tolerance)
+        if stats["p95_ms"] > limit:
+            regressions.append(f"{name}: p95 {stats['p95_ms']:.3f}ms > {limit:.3f}ms (baseline {base['p95_ms']:.3f}ms)")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'name':<28}{'count':>7}{'qps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, s in results.items():
+        print(f"{name:<28}{s['count']:>7}{s['throughput_qps']:>10.1f}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["pipeline", "helpers"], default="pipeline")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--replay-db", help="Replay user messages from a ChatHistory SQLite file")
+    parser.add_argument("--limit", type=int, help="Max replayed messages")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed passes before measuring")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    corpus = load_replay(args.replay_db, args.limit) if args.replay_db else load_corpus(args.corpus)
+    if not corpus:
+        parser.error("no queries to run")
+    run = bench_pipeline if args.target == "pipeline" else bench_helpers
+
+    if args.warmup:
+        run(corpus, args.warmup)
+    results = summarize(run(corpus, args.repeats))
+    print_table(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"target": args.target, "results": results}, f, indent=2)
+        print(f"✅ Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("target", args.target) != args.target:
+            parser.error(f"baseline was recorded for --target {baseline['target']}")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print("❌ Regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare the two speech-to-text input paths on the same recording:
+
+  file:      buffer -> temp WAV (soundfile) -> Whisper -> ffmpeg decode
+  in-memory: buffer -> float32 PCM at 16 kHz -> Whisper
+
+Usage:
+  python benchmarks/bench_stt_paths.py --record 4     # record a fixture once
+  python benchmarks/bench_stt_paths.py [--wav PATH] [--repeats N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import soundfile as sf
+
+from helpers.speech_helpers import SAMPLE_RATE, DEFAULT_MODEL, load_wav
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "query.wav")
+
+
+def record_fixture(path, seconds):
+    import sounddevice as sd
+    print(f"🎙️ Recording {seconds}s fixture to {path}...")
+    audio = sd.rec(int(seconds * SAMPLE_RATE), samplerate=SAMPLE_RATE, channels=1, dtype="float32")
+    sd.wait()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sf.write(path, audio, SAMPLE_RATE)
+
+
+def via_file(model, audio):
+    handle = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
+    handle.close()
+    try:
+        sf.write(handle.name, audio, SAMPLE_RATE)
+        return model.transcribe(handle.name, fp16=False)["text"]
+    finally:
+        os.remove(handle.name)
+
+
+def in_memory(model, audio):
+    return model.transcribe(audio, fp16=False)["text"]
+
+
+def bench(name, fn, model, audio, repeats):
+    timings = []
+    text = ""
+    for _ in range(repeats):
+        start = time.perf_counter()
+        text = fn(model, audio)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"{name:<10} median={statistics.median(timings):8.1f}ms  "
+          f"min={min(timings):8.1f}ms  max={max(timings):8.1f}ms  text={text.strip()!r}")
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", default=DEFAULT_FIXTURE)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--record", type=float, metavar="SECONDS", help="Record a new fixture first")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixture(args.wav, args.record)
+    if not os.path.exists(args.wav):
+        parser.error(f"fixture not found: {args.wav} (create one with --record SECONDS)")
+
+    import whisper
+    model = whisper.load_model(args.model)
+    audio = load_wav(args.wav)
+    in_memory(model, audio)  # warm up
+
+    file_ms = bench("file", via_file, model, audio, args.repeats)
+    mem_ms = bench("in-memory", in_memory, model, audio, args.repeats)
+    print(f"Saved {file_ms - mem_ms:.1f}ms per utterance ({(1 - mem_ms / file_ms) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Run WAV fixtures through the same streaming VAD capture pipeline the mic uses,
+offline. Reports where end-of-speech was detected, partial transcripts and
+the final transcript latency.
+
+Usage:
+  python benchmarks/bench_voice_capture.py FIXTURE.wav [...] [--realtime]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from helpers.speech_helpers import (FRAME_MS, SAMPLE_RATE, TranscriptionService, VoiceCapture,
+                                    load_wav, run_capture, wav_chunks)
+
+
+def paced(chunks):
+    """Deliver chunks at microphone speed."""
+    for chunk in chunks:
+        yield chunk
+        time.sleep(FRAME_MS / 1000)
+
+
+def run_fixture(service, path, realtime):
+    finished = threading.Event()
+    result = {}
+    consumed = [0]
+
+    def counting(chunks):
+        for chunk in chunks:
+            consumed[0] += len(chunk)
+            yield chunk
+
+    def on_partial(text):
+        print(f"   partial: {text!r}")
+
+    def on_speech_end():
+        result["end_at"] = time.perf_counter()
+
+    def on_final(text, error):
+        result["text"], result["error"] = text, error
+        result["final_at"] = time.perf_counter()
+        finished.set()
+
+    capture = VoiceCapture(service, on_final=on_final, on_partial=on_partial, on_speech_end=on_speech_end)
+    chunks = counting(wav_chunks(path))
+    run_capture(capture, paced(chunks) if realtime else chunks)
+    finished.wait()
+
+    total = len(load_wav(path)) / SAMPLE_RATE
+    print(f"{os.path.basename(path)}: audio={total:.2f}s  endpoint at {consumed[0] / SAMPLE_RATE:.2f}s  "
+          f"final transcription {(result['final_at'] - result['end_at']) * 1000:.0f}ms after endpoint")
+    print(f"   final: {result['text']!r}" + (f"  (error: {result['error']})" if result["error"] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="+")
+    parser.add_argument("--realtime", action="store_true", help="Feed audio at microphone pace (shows partials)")
+    args = parser.parse_args()
+
+    service = TranscriptionService()
+    service.preload()
+    service.ready.wait()
+    if service.load_error:
+        parser.error(f"could not load speech model: {service.load_error}")
+
+    for path in args.fixtures:
+        run_fixture(service, path, args.realtime)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Sweep the semantic search cutoffs over a labelled query set.
+
+Each line of the query file has a "query" and "expect": a list of words, one
+of which a correct hit's snippet contains (the price CSV's Reason), or null
+when no medicine should be suggested. For every (min_score, min_coverage)
+pair this prints how many positive queries got a correct top hit, how many
+returned hits were wrong, and how many negative queries got any suggestion.
+
+Usage:
+  python benchmarks/calibrate_semantic.py
+  python benchmarks/calibrate_semantic.py --queries benchmarks/semantic_queries.jsonl --show 0.5 0.6
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # helpers load data/ and model/ relative to the repo root
+
+from helpers import semantic_search as sem
+
+SCORES = [0.3, 0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.7]
+COVERAGES = [0.0, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8]
+
+
+def load_queries(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def correct(hit, expect):
+    snippet = hit["snippet"].lower()
+    return any(word in snippet for word in expect)
+
+
+def evaluate(index, queries, min_score, min_coverage, top_k=3):
+    found = wrong = false_alarms = 0
+    for q in queries:
+        hits = index.search(q["query"], top_k, min_score, min_coverage)
+        if q["expect"] is None:
+            false_alarms += bool(hits)
+            continue
+        found += bool(hits) and correct(hits[0], q["expect"])
+        wrong += sum(not correct(h, q["expect"]) for h in hits)
+    return found, wrong, false_alarms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", default=os.path.join("benchmarks", "semantic_queries.jsonl"))
+    parser.add_argument("--show", nargs=2, type=float, metavar=("MIN_SCORE", "MIN_COVERAGE"),
+                        help="Print the hits for every query at these cutoffs instead of sweeping")
+    args = parser.parse_args()
+
+    index = sem.get_index()
+    if index is None:
+        parser.error("no semantic index; run build_semantic_index.py first")
+    queries = load_queries(args.queries)
+    positives = sum(q["expect"] is not None for q in queries)
+    negatives = len(queries) - positives
+
+    if args.show:
+        for q in queries:
+            hits = index.search(q["query"], 3, *args.show)
+            print(f"{q['query']!r} expect={q['expect']}")
+            for h in hits:
+                mark = "✅" if q["expect"] and correct(h, q["expect"]) else "❌"
+                print(f"   {mark} {h['score']:.2f} cov={h['coverage']:.2f} {h['name'][:40]} | {h['snippet'][:60]}")
+        return
+
+    print(f"{'score':>5} {'cover':>5}  {'top-1 ok':>9}  {'wrong hits':>10}  {'false alarms':>12}")
+    for min_score in SCORES:
+        for min_coverage in COVERAGES:
+            found, wrong, false_alarms = evaluate(index, queries, min_score, min_coverage)
+            print(f"{min_score:5.2f} {min_coverage:5.2f}  {found:>4}/{positives:<4}  {wrong:>10}  "
+                  f"{false_alarms:>6}/{negatives:<5}")
+
+
+if __name__ == "__main__":
+    main()
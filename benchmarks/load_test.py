@@ -0,0 +1,156 @@
+"""
+Simulate concurrent chat sessions against the persistence layer.
+
+Each simulated user registers, logs in (check_user), sends messages (user and
+bot ChatHistory rows, plus a Prediction insert for symptom messages) and
+reloads its history, the same calls the Tk app makes. Runs against a
+temporary SQLite file unless --db is given.
+
+Usage:
+  python benchmarks/load_test.py --users 20 --messages 50
+  python benchmarks/load_test.py --users 8 --mode processes --timeout 0.5
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from helpers.db_helpers import Database, insert_prediction
+
+MESSAGES = [
+    ("hi", False), ("side effects of dolo 650", False), ("headache, high_fever, vomiting", True),
+    ("how to use crocin", False), ("itching, skin_rash", True), ("thanks", False),
+]
+
+
+def is_lock_error(e):
+    return isinstance(e, sqlite3.OperationalError) and "locked" in str(e)
+
+
+def run_user(user_no, db_path, messages, history_every, think_ms, timeout, seed):
+    """One simulated session; returns {op: [latencies]}, {error_kind: count}."""
+    rng = random.Random(seed + user_no)
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+
+    def timed(op, fn, *args):
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception as e:
+            errors["database is locked" if is_lock_error(e) else f"{op}: {type(e).__name__}"] += 1
+            return None
+        timings[op].append(time.perf_counter() - start)
+        return result
+
+    db = timed("connect", Database, db_path, timeout)
+    if db is None:
+        return dict(timings), dict(errors)
+    try:
+        username, password = f"loaduser_{seed}_{user_no}", "secret"
+        timed("register", db.add_user, username, f"{username}@example.com", password)
+        user = timed("login", db.check_user, username, password)
+        user_id = user[0] if user else user_no
+
+        for i in range(messages):
+            text, is_symptom = rng.choice(MESSAGES)
+            timed("add_chat_message", db.add_chat_message, user_id, text, "user")
+            if is_symptom:
+                timed("insert_prediction", insert_prediction, user_id, text.split(", "), "Simulated", db_path, timeout)
+            timed("add_chat_message", db.add_chat_message, user_id, f"reply to {text}", "bot")
+            if history_every and (i + 1) % history_every == 0:
+                timed("get_chat_history", db.get_chat_history, user_id)
+            if think_ms:
+                time.sleep(rng.uniform(0, think_ms) / 1000)
+    finally:
+        db.close()
+    return dict(timings), dict(errors)
+
+
+def _run_user_star(args):
+    return run_user(*args)
+
+
+def percentile(data, q):
+    data = sorted(data)
+    return data[min(len(data) - 1, int(len(data) * q / 100))] if data else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=30, help="Messages per user")
+    parser.add_argument("--history-every", type=int, default=10, help="Reload history every N messages (0 = never)")
+    parser.add_argument("--think-ms", type=float, default=0, help="Max random pause between messages")
+    parser.add_argument("--timeout", type=float, default=5.0, help="sqlite3 busy timeout in seconds")
+    parser.add_argument("--mode", choices=["threads", "processes"], default="threads")
+    parser.add_argument("--db", help="SQLite file to use (default: a fresh temporary file)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    db_path = args.db
+    if not db_path:
+        tmp_dir = tempfile.mkdtemp(prefix="medibot_load_")
+        db_path = os.path.join(tmp_dir, "load_test.db")
+    db_path = os.path.abspath(db_path)
+    Database(db_path).close()  # create the schema before the stampede
+
+    jobs = [(n, db_path, args.messages, args.history_every, args.think_ms, args.timeout, args.seed)
+            for n in range(args.users)]
+    start = time.perf_counter()
+    if args.mode == "processes":
+        with multiprocessing.Pool(args.users) as pool:
+            results = pool.map(_run_user_star, jobs)
+    else:
+        results = [None] * len(jobs)
+
+        def worker(i):
+            results[i] = run_user(*jobs[i])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(jobs))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    wall = time.perf_counter() - start
+
+    timings, errors = defaultdict(list), defaultdict(int)
+    for user_timings, user_errors in results:
+        for op, samples in user_timings.items():
+            timings[op].extend(samples)
+        for kind, count in user_errors.items():
+            errors[kind] += count
+
+    total_ops = sum(len(s) for s in timings.values())
+    print(f"👥 {args.users} users x {args.messages} messages ({args.mode}) on {db_path}")
+    print(f"⏱️ {wall:.2f}s wall, {total_ops} ok ops, {total_ops / wall:.1f} ops/s")
+    print(f"{'operation':<20}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for op, samples in sorted(timings.items()):
+        ms = [s * 1000 for s in samples]
+        print(f"{op:<20}{len(ms):>8}{statistics.mean(ms):>10.2f}{percentile(ms, 50):>10.2f}"
+              f"{percentile(ms, 95):>10.2f}{percentile(ms, 99):>10.2f}{max(ms):>10.2f}")
+    if errors:
+        print("❌ Errors:")
+        for kind, count in sorted(errors.items()):
+            print(f"  {kind}: {count}")
+    else:
+        print("✅ No errors")
+
+    if tmp_dir:
+        for name in os.listdir(tmp_dir):
+            os.remove(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Break down the process's resident memory by component.
+
+Imports the chatbot one module at a time and records the RSS growth each
+import causes, then sizes the data structures each module keeps loaded.
+Run it once normally and once with --compact to see what compact mode saves.
+
+Usage:
+  python benchmarks/memory_report.py
+  python benchmarks/memory_report.py --compact
+  python benchmarks/memory_report.py --json report.json
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # helpers load data/ and model/ relative to the repo root
+
+# Import order matters: each step is charged only for what it adds
+STEPS = [
+    ("python + pandas/numpy", ["pandas", "numpy"]),
+    ("scikit-learn", ["sklearn"]),
+    ("disease model + tables", ["helpers.predict_helpers"]),
+    ("symptom bitsets", ["helpers.symptom_index"]),
+    ("MID catalogue", ["helpers.medicine_helpers"]),
+    ("medicine prices", ["helpers.example_medicine_helper"]),
+    ("intent model", ["helpers.intent_helpers"]),
+    ("spaCy pipeline", ["helpers.nlp_helpers"]),
+    ("chatbot", ["chatbot"]),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--compact", action="store_true", help="Load with MEDIBOT_COMPACT=1")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    if args.compact:
+        os.environ["MEDIBOT_COMPACT"] = "1"
+    from helpers import memory_helpers as memh
+
+    gc.collect()
+    start = previous = memh.rss_bytes()
+    steps = []
+    for label, modules in STEPS:
+        try:
+            for name in modules:
+                importlib.import_module(name)
+        except Exception as e:
+            print(f"⚠️ {label}: {e}")
+        gc.collect()
+        current = memh.rss_bytes()
+        steps.append({"step": label, "rss_delta_bytes": current - previous})
+        previous = current
+
+    sizes = memh.component_sizes()
+    print(f"🧠 RSS {previous / 1e6:.1f} MB after loading (started at {start / 1e6:.1f} MB), "
+          f"compact mode {'on' if memh.COMPACT else 'off'}")
+    print(f"\n{'import step':<28}{'RSS delta MB':>14}")
+    for row in steps:
+        print(f"{row['step']:<28}{row['rss_delta_bytes'] / 1e6:>14.2f}")
+    print(f"\n{'loaded structure':<28}{'size MB':>14}")
+    for label, size in sorted(sizes, key=lambda item: -item[1]):
+        print(f"{label:<28}{size / 1e6:>14.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "compact": memh.COMPACT,
+                "rss_start_bytes": start,
+                "rss_end_bytes": previous,
+                "steps": steps,
+                "structures": [{"component": label, "bytes": size} for label, size in sizes],
+            }, f, indent=2)
+        print(f"✅ Report saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Build the offline semantic search index over medicine descriptions.
+
+Documents are MID productuses + productintroduction and the Reason +
+Description columns of medicine_with_real_prices.csv. Texts are embedded
+with TF-IDF followed by truncated SVD (LSA), L2-normalised, and saved as a
+float32 matrix that helpers/semantic_search.py memory-maps at query time,
+next to a sparse document-term matrix used to check that a hit actually
+contains the query's words.
+
+Usage:
+  python build_semantic_index.py
+  python build_semantic_index.py --dims 256 --out model/semantic
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ["MEDIBOT_DATA_BACKEND"] = "pandas"  # the indexer reads the source files
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import make_pipeline
+
+from helpers import memory_helpers as memh
+from helpers import semantic_search as sem
+
+PRICES_CSV = os.path.join("data", "medicine_with_real_prices.csv")
+
+
+def _join(*values):
+    return " ".join(str(v).strip() for v in values if isinstance(v, str) and v.strip())
+
+
+def collect_documents(catalogue_path, prices_path):
+    """[(source, name, text)], one per distinct (source, text); the first product name is kept."""
+    docs = {}
+    try:
+        from helpers import medicine_helpers as mh
+        same_file = os.path.abspath(catalogue_path) == os.path.abspath(mh.excel_path)
+        mid = mh.df if same_file and not mh.df.empty else mh.load_catalogue(catalogue_path)
+        for name, uses, intro in zip(mid["name"], mid.get("productuses", [None] * len(mid)),
+                                     mid.get("productintroduction", [None] * len(mid))):
+            text = _join(uses, intro)
+            if text:
+                docs.setdefault(("mid", text), name)
+    except Exception as e:
+        print("⚠️ Skipping MID.xlsx:", e)
+
+    prices = pd.read_csv(prices_path, usecols=lambda c: not memh.is_unused_column(c))
+    for name, reason, desc in zip(prices["Drug_Name"], prices["Reason"], prices["Description"]):
+        text = _join(reason, desc)
+        if text and isinstance(name, str):
+            docs.setdefault(("prices", text), name)
+    return [(source, name, text) for (source, text), name in docs.items()]
+
+
+def build_index(docs, out, dims=128, max_features=100000, min_df=2):
+    """Fit the encoder on docs ([(source, name, text)]) and write the index files to out."""
+    texts = [text for _, _, text in docs]
+    dims = min(dims, len(docs) - 1)
+    encoder = make_pipeline(
+        TfidfVectorizer(sublinear_tf=True, stop_words="english", ngram_range=(1, 2), min_df=min_df,
+                        max_features=max_features, dtype=np.float32),
+        TruncatedSVD(n_components=dims, random_state=0),
+    )
+    vectors = encoder.fit_transform(texts).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.maximum(norms, 1e-12)
+    # Which vocabulary terms each document contains, for the term-coverage check
+    terms = (encoder[0].transform(texts) > 0).astype(np.uint8).tocsr()
+
+    os.makedirs(out, exist_ok=True)
+    np.save(os.path.join(out, sem.VECTORS_FILE), vectors)
+    sparse.save_npz(os.path.join(out, sem.TERMS_FILE), terms)
+    joblib.dump(encoder, os.path.join(out, sem.ENCODER_FILE))
+    with open(os.path.join(out, sem.DOCS_FILE), "w", encoding="utf-8") as f:
+        json.dump({"sources": [s for s, _, _ in docs], "names": [n for _, n, _ in docs],
+                   "snippets": [t[:200] for t in texts]}, f, ensure_ascii=False)
+    return vectors, encoder[-1].explained_variance_ratio_.sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--catalogue", default=os.path.join("assets", "MID.xlsx"))
+    parser.add_argument("--prices", default=PRICES_CSV)
+    parser.add_argument("--dims", type=int, default=128, help="LSA dimensions")
+    parser.add_argument("--max-features", type=int, default=100000)
+    parser.add_argument("--out", default=sem.INDEX_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    docs = collect_documents(args.catalogue, args.prices)
+    if not docs:
+        parser.error("no documents to index")
+    print(f"📚 {len(docs)} distinct documents")
+
+    vectors, explained = build_index(docs, args.out, args.dims, args.max_features)
+    print(f"✅ {vectors.shape[0]}x{vectors.shape[1]} float32 ({vectors.nbytes / 1e6:.1f} MB), "
+          f"{explained:.0%} variance kept, built in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,126 +1,230 @@
-import sqlite3
-import pickle
 from helpers import predict_helpers as ph
 from helpers import medicine_helpers as mh
 from helpers import example_medicine_helper as emh
 from helpers import nlp_helpers as nlp
-import pandas as pd
+from helpers import intent_helpers as ih
+from helpers import symptom_index as si
+from helpers import query_parser as qp
+from helpers import metrics
+from helpers import db_helpers as db
+from helpers import profiling
+from helpers import session_state as ss
+from helpers import semantic_search as sem
 from difflib import get_close_matches
-import re
 import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Load ML intent model
-try:
-    model_path = os.path.join(BASE_DIR, "intent_model.pkl")
-    intent_model, intent_vectorizer = pickle.load(open(model_path, "rb"))
-except Exception as e:
-    print("⚠️ Error loading intent model:", e)
-
-# Load medicine data
-try:
-    excel_path = os.path.join(BASE_DIR, 'assets', 'MID.xlsx')
-    df = pd.read_excel(excel_path)
-    df.columns = df.columns.str.strip().str.lower()
-    df["name"] = df["name"].astype(str).str.strip().str.lower()
-except FileNotFoundError:
-    print("❌ Error: MID.xlsx not found. Make sure it's in the 'backend/assets/' directory.")
+# Medicine names come from the MID table medicine_helpers already loaded
+df = mh.df
+names = mh.names
+name_set = mh.name_set
+
+
+# Fixed replies; also pre-rendered by the TTS audio cache
+GREETING_RESPONSE = "👋 Hello! How can I help you today?"
+THANKS_RESPONSE = "🙏 You're welcome! Feel free to ask anything!"
+FAREWELL_RESPONSE = "👋 Goodbye! Take care of your health!"
+IMAGE_RESPONSE = "📸 Image support is coming soon!"
+NO_ALTERNATIVES_RESPONSE = "❌ Sorry, I couldn't find alternatives for that medicine."
+UNKNOWN_MEDICINE_RESPONSE = "❌ Sorry, I couldn't understand. Please enter symptoms (comma separated) or a known medicine name."
+NO_DISEASE_RESPONSE = ("🔍 I couldn't identify a disease based on the symptoms provided.\n"
+                       "Please provide more details or correct symptoms.")
+NAME_RESPONSE = "I'm a medical chatbot, I don't need to know your name. How can I help with your symptoms or medicine questions?"
+FALLBACK_RESPONSE = ("❓ Sorry, I couldn't understand that. Try asking:\n"
+                     "- 'Tell me about Avastin'\n"
+                     "- 'Side effects of Andol'\n"
+                     "- 'How to use Bevacizumab'\n"
+                     "- Or list your symptoms like 'headache, fever'")
+CANNED_RESPONSES = [
+    GREETING_RESPONSE, THANKS_RESPONSE, FAREWELL_RESPONSE, IMAGE_RESPONSE, NO_ALTERNATIVES_RESPONSE,
+    UNKNOWN_MEDICINE_RESPONSE, NO_DISEASE_RESPONSE, NAME_RESPONSE, FALLBACK_RESPONSE,
+]
 
 
 def classify_intent(text):
-    try:
-        vec = intent_vectorizer.transform([text])
-        return intent_model.predict(vec)[0]
-    except:
-        return "general"
+    return ih.classify_intent(text)
 
 
 def extract_medicine_name(query):
-    keywords = ["uses", "side effects", "composition", "manufacturer", "how to use",
-                "how does it work", "benefits", "safety", "habit forming", "class"]
-    cleaned_query = query.lower()
-    
-    for keyword in keywords:
-        cleaned_query = cleaned_query.replace(keyword, "").strip()
+    return qp.parse_query(query).medicine_name
 
-    cleaned_query = re.sub(r"\b(what|is|the|of|tell|me|about|effects|are|side|"
-                           r"manufacture|please|information|details|give|tablet|"
-                           r"capsule|syrup|medicine|med)\b", "", cleaned_query)
-    
-    cleaned_query = re.sub(r"[^a-zA-Z0-9\s]", "", cleaned_query).strip()
-    return cleaned_query
 
-
-def find_best_match(name):
-    names = df["name"].dropna().tolist()
-    extracted = extract_medicine_name(name)
-
-    if extracted in names:
+def match_medicine_name(extracted):
+    if extracted in name_set:
         return extracted
 
+    # Spoken/misspelled names ("dollo six fifty") resolve through hashed lookups
+    indexed = mh.get_name_index().lookup(extracted)
+    if indexed:
+        return indexed
+
     matches = get_close_matches(extracted, names, n=1, cutoff=0.6)
     return matches[0] if matches else None
 
 
+def find_best_match(name):
+    return match_medicine_name(extract_medicine_name(name))
+
+
 def get_info_type(query):
-    query = query.lower()
-    if any(kw in query for kw in ["how to use", "how do i take", "usage", "use"]):
-        return "howtouse"
-    elif any(kw in query for kw in ["side effect", "adverse effect"]):
-        return "sideeffect"
-    elif "benefit" in query:
-        return "productbenefits"
-    elif "safety" in query:
-        return "safetyadvice"
-    elif "habit" in query or "addictive" in query:
-        return "habit_forming"
-    elif "chemical" in query:
-        return "chemical_class"
-    elif "therapeutic" in query:
-        return "therapeutic_class"
-    elif "action" in query:
-        return "action_class"
-    elif "composition" in query:
-        return "contains"
-    else:
-        return None
+    return qp.parse_query(query).info_type
+
+
+def format_differential(candidates):
+    if len(candidates) < 2:
+        return ""
+    lines = ["\n\n🔎 **Top matches**:"]
+    for c in candidates:
+        # No percentage from a 0/1 model, nor for candidates ranked by symptom match alone
+        score = f"{c['probability'] * 100:.0f}%, " if c["probability"] else ""
+        lines.append(f"- {c['disease']} ({score}{c['matched']}/{c['profile_size']} typical symptoms matched)")
+    return "\n".join(lines)
+
+
+def format_followups(followups):
+    if not followups:
+        return ""
+    names = ", ".join(f"'{f.replace('_', ' ').strip()}'" for f in followups)
+    return f"\n\n❔ To narrow this down, do you also have any of: {names}?"
 
 
+@profiling.profiled("get_bot_response")
 def get_bot_response(message, user_id=None):
+    with metrics.trace("get_bot_response"):
+        return _respond(message, user_id)
+
+
+def alternatives_response(medicine_name, matched_medicine=None):
+    """Exact generic substitutes (same composition) first, then similar-name alternatives."""
+    sections = []
+    if matched_medicine:
+        with metrics.stage("find_exact_substitutes"):
+            substitutes = mh.find_exact_substitutes(matched_medicine)
+        if substitutes:
+            sections.append(f"🧬 Same composition as {matched_medicine.title()}:\n" + "\n".join(substitutes))
+    with metrics.stage("find_alternative_medicines"):
+        alternatives = emh.find_alternative_medicines(medicine_name, catalogue_name=matched_medicine)
+    if alternatives:
+        sections.append("💊 Alternative Medicines:\n" + "\n".join(alternatives))
+    return "\n\n".join(sections) if sections else NO_ALTERNATIVES_RESPONSE
+
+
+def semantic_suggestions(message):
+    """Medicines whose descriptions match a need described in words, or None."""
+    with metrics.stage("semantic_search"):
+        hits = sem.search(message, top_k=3)
+    if not hits:
+        return None
+    lines = ["🔎 **Medicines that may be relevant**:"]
+    for hit in hits:
+        name = hit["name"].title() if hit["source"] == "mid" else hit["name"]
+        lines.append(f"💊 {name} - {hit['snippet']}")
+    return "\n".join(lines)
+
+
+def warm_up():
+    """Build the lazily-built medicine indexes ahead of the first query."""
+    mh.get_name_index()
+    mh.get_composition_index()
+    sem.get_index()
+
+
+def end_session(user_id):
+    """Forget the conversation context (logout / new chat)."""
+    ss.sessions.forget(user_id)
+
+
+# Disease field -> (emoji, label, lookup) for follow-ups on the last prediction
+DISEASE_FIELDS = {
+    "description": ("📝", "Description", ph.get_description),
+    "medications": ("💊", "Medications", ph.get_medications),
+    "precautions": ("⚠️", "Precautions", ph.get_precautions),
+    "diets": ("🥗", "Diet", ph.get_diets),
+    "workouts": ("🏃", "Workouts", ph.get_workouts),
+}
+
+
+def answer_followup(message_lower, user_id):
+    """
+    Answer a bare follow-up ("side effects?", "what about diet") from the
+    entity the user's previous answer was about, or None to take the normal path.
+    """
+    state = ss.sessions.get(user_id)
+    if state is None:
+        return None
+
+    if state.kind == "medicine":
+        parsed = qp.parse_query(message_lower)
+        if not qp.is_followup(parsed):
+            return None
+        if parsed.wants_alternative:
+            return alternatives_response(state.name, state.name)
+        if state.record is None:
+            return None
+        return mh.format_medicine_info(state.record, parsed.info_type)
+
+    field = qp.parse_disease_followup(message_lower)
+    if field is None:
+        return None
+    emoji, label, lookup = DISEASE_FIELDS[field]
+    return f"{emoji} **{label}** for {state.name}: {lookup(state.name)}"
+
+
+def save_prediction(user_id, symptoms, disease, matched_symptoms=None):
+    try:
+        db.insert_prediction(user_id, symptoms, disease, matched_symptoms=matched_symptoms)
+    except Exception as e:
+        print("[DB ERROR] Failed to insert prediction:", e)
+
+
+def _respond(message, user_id=None):
     message_lower = message.lower().strip()
 
+    # Follow-ups about the last medicine/disease skip classification and matching
+    if user_id:
+        with metrics.stage("session_followup"):
+            followup = answer_followup(message_lower, user_id)
+        if followup is not None:
+            return followup
+
     # Predict intent
-    intent = classify_intent(message_lower)
+    with metrics.stage("classify_intent"):
+        intent = classify_intent(message_lower)
 
     # INTENT HANDLING
     if intent == "greeting":
-        return "👋 Hello! How can I help you today?"
+        return GREETING_RESPONSE
 
     elif intent == "thanks":
-        return "🙏 You're welcome! Feel free to ask anything!"
+        return THANKS_RESPONSE
 
     elif intent == "farewell":
-        return "👋 Goodbye! Take care of your health!"
+        return FAREWELL_RESPONSE
 
     elif intent == "image_request":
-        return "📸 Image support is coming soon!"
+        return IMAGE_RESPONSE
 
     elif intent == "medicine_query":
+        with metrics.stage("parse_query"):
+            parsed = qp.parse_query(message_lower)
+
         # Handle alternative medicine queries
-        if "alternative" in message_lower:
-            med_name = message_lower.replace("alternative", "").strip()
-            alternatives = emh.find_alternative_medicines(med_name)
-            if alternatives:
-                return "💊 Alternative Medicines:\n" + "\n".join(alternatives)
-            else:
-                return "❌ Sorry, I couldn't find alternatives for that medicine."
+        if parsed.wants_alternative:
+            with metrics.stage("find_best_match"):
+                matched_medicine = match_medicine_name(parsed.medicine_name)
+            return alternatives_response(parsed.medicine_name, matched_medicine)
 
         # General or specific medicine queries
-        matched_medicine = find_best_match(message_lower)
+        with metrics.stage("find_best_match"):
+            matched_medicine = match_medicine_name(parsed.medicine_name)
         if matched_medicine:
-            info_type = get_info_type(message_lower)
-            result = mh.search_medicine(matched_medicine, info_type)
+            info_type = parsed.info_type
+            with metrics.stage("search_medicine"):
+                record = mh.get_medicine_record(matched_medicine)
+                result = mh.format_medicine_info(record, info_type)
+            if user_id:
+                ss.sessions.remember(user_id, "medicine", matched_medicine, record)
 
             if info_type:
                 # Return only the requested field
@@ -134,21 +238,28 @@ def get_bot_response(message, user_id=None):
                 )
                 return result + follow_up
 
-        return "❌ Sorry, I couldn't understand. Please enter symptoms (comma separated) or a known medicine name."
+        return semantic_suggestions(message_lower) or UNKNOWN_MEDICINE_RESPONSE
 
     elif intent == "symptom_check":
-        symptoms = nlp.extract_symptoms(message)
+        with metrics.stage("extract_symptoms"):
+            symptoms = nlp.extract_symptoms(message)
         if not symptoms:
             symptoms = [s.strip().lower() for s in message.split(",") if s.strip()]
 
         if len(symptoms) >= 1:
-            disease = ph.predict_disease(symptoms)
-            if disease:
-                description = ph.get_description(disease)
-                meds = ph.get_medications(disease)
-                precautions = ph.get_precautions(disease)
-                workouts = ph.get_workouts(disease)
-                diets = ph.get_diets(disease)
+            with metrics.stage("predict_disease"):
+                matched_symptoms = ph.match_symptoms(symptoms)
+                candidates = ph.predict_top_diseases(matched_symptoms)
+            if candidates:
+                disease = candidates[0]["disease"]
+                if user_id:
+                    ss.sessions.remember(user_id, "disease", disease)
+                with metrics.stage("enrichment"):
+                    description = ph.get_description(disease)
+                    meds = ph.get_medications(disease)
+                    precautions = ph.get_precautions(disease)
+                    workouts = ph.get_workouts(disease)
+                    diets = ph.get_diets(disease)
 
                 response = f"🩺 **Predicted Disease**: {disease}\n\n"
                 response += f"📝 **Description**: {description}\n"
@@ -156,31 +267,20 @@ def get_bot_response(message, user_id=None):
                 response += f"⚠️ **Precautions**: {precautions}\n"
                 response += f"🥗 **Diet**: {diets}\n"
                 response += f"🏃 **Workouts**: {workouts}"
+                response += format_differential(candidates)
+                with metrics.stage("suggest_followups"):
+                    response += format_followups(si.suggest_followups(matched_symptoms))
 
                 # Save prediction to DB
                 if user_id:
-                    try:
-                        conn = sqlite3.connect("medical_chatbot.db")
-                        cursor = conn.cursor()
-                        cursor.execute(
-                            "INSERT INTO Prediction (user_id, symptoms, predicted_disease) VALUES (?, ?, ?)",
-                            (user_id, ', '.join(symptoms), disease)
-                        )
-                        conn.commit()
-                        conn.close()
-                    except Exception as e:
-                        print("[DB ERROR] Failed to insert prediction:", e)
+                    with metrics.stage("db_insert"):
+                        save_prediction(user_id, symptoms, disease, matched_symptoms)
 
                 return response
 
-            return ("🔍 I couldn't identify a disease based on the symptoms provided.\n"
-                    "Please provide more details or correct symptoms.")
+            return NO_DISEASE_RESPONSE
 
     elif "my name is" in message_lower or "i am" in message_lower:
-        return "I'm a medical chatbot, I don't need to know your name. How can I help with your symptoms or medicine questions?"
+        return NAME_RESPONSE
 
-    return ("❓ Sorry, I couldn't understand that. Try asking:\n"
-            "- 'Tell me about Avastin'\n"
-            "- 'Side effects of Andol'\n"
-            "- 'How to use Bevacizumab'\n"
-            "- Or list your symptoms like 'headache, fever'")
+    return semantic_suggestions(message_lower) or FALLBACK_RESPONSE
@@ -0,0 +1,168 @@
+"""
+Load the MID catalogue and the alternatives CSV into the MedicineInfo and
+AlternativeMedicine tables, precomputing the top-N alternatives for every
+medicine. Afterwards the app can run with MEDIBOT_DATA_BACKEND=sqlite and
+skip loading either dataset into pandas.
+
+Usage:
+  python etl_medicines.py
+  python etl_medicines.py --db medical_chatbot.db --top-n 5 --workers 4
+  python etl_medicines.py --skip-alternatives
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import time
+
+os.environ["MEDIBOT_DATA_BACKEND"] = "pandas"  # the ETL reads the source files
+
+from helpers import composition_index as ci
+from helpers import medicine_alternatives as alt
+from helpers import medicine_store as ms
+from helpers import name_index as ni
+
+# medicine_helpers / example_medicine_helper load MID.xlsx and the price CSV on
+# import; they are imported inside main() so spawned pool workers (Windows,
+# macOS), which re-import this module, don't each load both datasets again.
+MID_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "MID.xlsx")
+
+MAX_POSTING = 2000  # tokens shared by more products than this are too common to narrow candidates
+
+_records = None
+_postings = None
+
+
+def _text(value):
+    return None if value is None or value != value else str(value)  # NaN -> NULL
+
+
+def _tokens(name):
+    return {w for w in ni.name_terms(name) if len(w) >= 3}
+
+
+def _init_worker(records):
+    """Token -> record postings, so each medicine is scored against plausible names only."""
+    global _records, _postings
+    _records = records
+    _postings = {}
+    for i, record in enumerate(records):
+        for token in _tokens(record.name_lower):
+            _postings.setdefault(token, []).append(i)
+
+
+def _alternatives_for(job):
+    medicine_id, name, top_n = job
+    candidates = set()
+    for token in _tokens(name):
+        posting = _postings.get(token, ())
+        if len(posting) <= MAX_POSTING:
+            candidates.update(posting)
+    matches = alt.rank_alternatives(name, [_records[i] for i in sorted(candidates)], top_n)
+    return [(medicine_id, m["name"], rank, m["score"], None if m["price"] == float("inf") else m["price"],
+             m["desc"], m["reason"]) for rank, m in enumerate(matches, 1)]
+
+
+def chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def load_medicines(conn, catalogue, chunk_size):
+    mid_columns = list(ms.MEDICINE_COLUMNS)
+    catalogue = catalogue.drop_duplicates("name")
+    values = [catalogue[c].tolist() if c in catalogue.columns else [None] * len(catalogue) for c in mid_columns]
+    rows = []
+    for fields in zip(*values):
+        record = dict(zip(mid_columns, fields))
+        rows.append([_text(v) for v in fields] + [ci.composition_key(record.get("contains"))])
+
+    columns = list(ms.MEDICINE_COLUMNS.values()) + ["composition_key"]
+    sql = f"INSERT INTO MedicineInfo ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    for chunk in chunks(rows, chunk_size):
+        with conn:
+            conn.executemany(sql, chunk)
+    return len(rows)
+
+
+def load_alternatives(conn, records, top_n, workers, chunk_size):
+    medicines = conn.execute("SELECT medicine_id, medicine_name FROM MedicineInfo ORDER BY medicine_id").fetchall()
+    jobs = [(medicine_id, name, top_n) for medicine_id, name in medicines]
+    sql = ("INSERT INTO AlternativeMedicine (medicine_id, alternative_name, rank, score, price, description, reason) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+    total = 0
+    pending = []
+    start = time.perf_counter()
+    if workers > 1:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(records,))
+        results = pool.imap(_alternatives_for, jobs, chunksize=256)
+    else:
+        pool = None
+        _init_worker(records)
+        results = map(_alternatives_for, jobs)
+    try:
+        for done, rows in enumerate(results, 1):
+            pending.extend(rows)
+            if len(pending) >= chunk_size:
+                with conn:
+                    conn.executemany(sql, pending)
+                total += len(pending)
+                pending = []
+            if done % 5000 == 0:
+                print(f"  {done}/{len(jobs)} medicines, {done / (time.perf_counter() - start):.0f}/s")
+        if pending:
+            with conn:
+                conn.executemany(sql, pending)
+            total += len(pending)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=ms.STORE_PATH)
+    parser.add_argument("--catalogue", default=MID_PATH, help="MID.xlsx")
+    parser.add_argument("--top-n", type=int, default=5, help="Alternatives stored per medicine")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per executemany transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--skip-alternatives", action="store_true")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    ms.ensure_schema(conn)
+
+    start = time.perf_counter()
+    # Full refresh; indexes are dropped so the bulk insert doesn't maintain them row by row
+    with conn:
+        conn.execute("DROP INDEX IF EXISTS idx_medicine_name")
+        conn.execute("DROP INDEX IF EXISTS idx_medicine_composition")
+        conn.execute("DROP INDEX IF EXISTS idx_alternative_medicine")
+        conn.execute("DELETE FROM AlternativeMedicine")
+        conn.execute("DELETE FROM MedicineInfo")
+
+    from helpers import medicine_helpers as mh
+    catalogue = mh.df if os.path.abspath(args.catalogue) == os.path.abspath(mh.excel_path) else mh.load_catalogue(args.catalogue)
+    if catalogue.empty:
+        parser.error(f"no medicines loaded from {args.catalogue}")
+    count = load_medicines(conn, catalogue, args.chunk_size)
+    print(f"✅ {count} medicines loaded in {time.perf_counter() - start:.1f}s")
+
+    if not args.skip_alternatives:
+        step = time.perf_counter()
+        from helpers import example_medicine_helper as emh
+        alternatives = load_alternatives(conn, emh.medicine_records, args.top_n, args.workers, args.chunk_size)
+        print(f"✅ {alternatives} alternatives precomputed in {time.perf_counter() - step:.1f}s")
+
+    ms.create_indexes(conn)
+    conn.execute("ANALYZE")
+    conn.close()
+    print(f"✅ Done in {time.perf_counter() - start:.1f}s -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
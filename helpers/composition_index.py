@@ -0,0 +1,73 @@
+# helpers/composition_index.py
+
+import re
+
+# Spelling variants of the same unit in the MID `contains` column
+UNIT_ALIASES = {
+    "gm": "g", "gms": "g", "gram": "g", "grams": "g",
+    "mgs": "mg", "milligram": "mg", "milligrams": "mg",
+    "microgram": "mcg", "micrograms": "mcg", "µg": "mcg", "ug": "mcg",
+    "iu": "iu", "units": "iu", "unit": "iu",
+}
+
+_part_re = re.compile(r"^(?P<salt>[^()]*?)\s*(?:\((?P<strength>[^)]*)\))?\s*$")
+_number_re = re.compile(r"\d+(?:\.\d+)?")
+_unit_re = re.compile(r"[a-zµ]+")
+_salt_clean_re = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize_strength(strength):
+    """'650 mg' / '650.0mg' -> '650mg'; '0.5% w/w' -> '0.5%w/w'."""
+    s = strength.lower().replace(" ", "")
+    s = _number_re.sub(lambda m: m.group().rstrip("0").rstrip(".") if "." in m.group() else m.group(), s)
+    return _unit_re.sub(lambda m: UNIT_ALIASES.get(m.group(), m.group()), s)
+
+
+def parse_composition(contains):
+    """
+    "Amoxycillin (500mg) + Clavulanic Acid (125mg)" ->
+    [("amoxycillin", "500mg"), ("clavulanic acid", "125mg")]
+
+    Returns [] if any part can't be parsed: a partial ingredient list would
+    make a combination product look like a substitute for one of its salts.
+    """
+    if not isinstance(contains, str):
+        return []
+    ingredients = []
+    for part in contains.split("+"):
+        m = _part_re.match(part.strip().lower())
+        if not m:
+            return []
+        salt = " ".join(_salt_clean_re.sub(" ", m.group("salt")).split())
+        if not salt:
+            return []
+        strength = normalize_strength(m.group("strength") or "")
+        ingredients.append((salt, strength))
+    return ingredients
+
+
+def composition_key(contains):
+    """Canonical key for a composition: ingredients sorted, so order in the text doesn't matter; "" if unparseable."""
+    ingredients = sorted(set(parse_composition(contains)))
+    return "+".join(f"{salt}:{strength}" for salt, strength in ingredients)
+
+
+class CompositionIndex:
+    """Products grouped by identical composition (same salts at the same strengths)."""
+
+    def __init__(self, names, contains):
+        self.key_of = {}
+        self.products = {}
+        for name, text in zip(names, contains):
+            key = composition_key(text)
+            if not key or name in self.key_of:
+                continue
+            self.key_of[name] = key
+            self.products.setdefault(key, []).append(name)
+
+    def substitutes(self, name):
+        """Other products with exactly the same composition as `name`."""
+        key = self.key_of.get(name)
+        if key is None:
+            return []
+        return [other for other in self.products[key] if other != name]
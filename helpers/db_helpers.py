@@ -0,0 +1,227 @@
+# helpers/db_helpers.py
+
+import hashlib
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DB_PATH = os.path.join(BASE_DIR, "medical_chatbot.db")
+
+
+class Database:
+    def __init__(self, db_name="medical_chatbot.db", timeout=5.0):
+        self.db_name = os.path.join(BASE_DIR, db_name)
+        self._check_and_recreate_db_if_needed()
+        self.conn = sqlite3.connect(self.db_name, timeout=timeout, check_same_thread=False)
+        self.cursor = self.conn.cursor()
+        self.create_tables()
+
+    def _check_and_recreate_db_if_needed(self):
+        if not os.path.exists(self.db_name): return
+        try:
+            with sqlite3.connect(self.db_name) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM User LIMIT 1")
+                cursor.execute("SELECT 1 FROM ChatHistory LIMIT 1")
+        except sqlite3.OperationalError as e:
+            print(f"Database schema error: {e}. Backing up and recreating database.")
+            backup_name = self.db_name + f".backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            os.rename(self.db_name, backup_name)
+            print(f"Backed up corrupt database to {backup_name}")
+
+    def create_tables(self):
+        self.cursor.execute('''CREATE TABLE IF NOT EXISTS User (id INTEGER PRIMARY KEY, username TEXT UNIQUE NOT NULL, email TEXT UNIQUE NOT NULL, password TEXT NOT NULL)''')
+        self.cursor.execute('''CREATE TABLE IF NOT EXISTS ChatHistory (id INTEGER PRIMARY KEY, user_id INTEGER, message_text TEXT, sender_type TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (user_id) REFERENCES User(id))''')
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_user ON ChatHistory(user_id, timestamp)")
+        self.cursor.execute('''CREATE TABLE IF NOT EXISTS Prediction (id INTEGER PRIMARY KEY, user_id INTEGER, symptoms TEXT, predicted_disease TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (user_id) REFERENCES User(id))''')
+        self.conn.commit()
+        ensure_analytics_schema(self.conn)
+
+    def hash_password(self, password): return hashlib.sha256(password.encode()).hexdigest()
+    def add_user(self, username, email, password):
+        try:
+            self.cursor.execute("INSERT INTO User (username, email, password) VALUES (?, ?, ?)", (username, email, self.hash_password(password)))
+            self.conn.commit(); return True
+        except sqlite3.IntegrityError: return False
+    def check_user(self, username, password):
+        self.cursor.execute("SELECT id, username, email FROM User WHERE username = ? AND password = ?", (username, self.hash_password(password)))
+        return self.cursor.fetchone()
+    def update_password(self, email, new_password):
+        self.cursor.execute("UPDATE User SET password = ? WHERE email = ?", (self.hash_password(new_password), email))
+        self.conn.commit(); return self.cursor.rowcount > 0
+    def add_chat_message(self, user_id, message, sender):
+        self.cursor.execute("INSERT INTO ChatHistory (user_id, message_text, sender_type) VALUES (?, ?, ?)", (user_id, message, sender))
+        self.conn.commit()
+    def get_chat_history(self, user_id):
+        self.cursor.execute("SELECT message_text, sender_type FROM ChatHistory WHERE user_id = ? ORDER BY timestamp ASC, id ASC", (user_id,))
+        return self.cursor.fetchall()
+    def clear_user_history(self, user_id):
+        self.cursor.execute("DELETE FROM ChatHistory WHERE user_id = ?", (user_id,)); self.conn.commit()
+    def close(self):
+        self.conn.close()
+
+
+# Analytics side tables, kept in step with Prediction by insert_prediction
+ANALYTICS_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS PredictionSymptom (
+        prediction_id INTEGER NOT NULL, user_id INTEGER, symptom TEXT NOT NULL, day TEXT NOT NULL,
+        FOREIGN KEY (prediction_id) REFERENCES Prediction(id))""",
+    "CREATE INDEX IF NOT EXISTS idx_prediction_symptom_prediction ON PredictionSymptom(prediction_id)",
+    "CREATE INDEX IF NOT EXISTS idx_prediction_symptom_symptom ON PredictionSymptom(symptom, day)",
+    """CREATE TABLE IF NOT EXISTS DailyDiseaseCount (
+        day TEXT NOT NULL, disease TEXT NOT NULL, count INTEGER NOT NULL,
+        PRIMARY KEY (day, disease)) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS DailySymptomCount (
+        day TEXT NOT NULL, symptom TEXT NOT NULL, count INTEGER NOT NULL,
+        PRIMARY KEY (day, symptom)) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS UserSymptomCount (
+        user_id INTEGER NOT NULL, symptom TEXT NOT NULL, count INTEGER NOT NULL,
+        PRIMARY KEY (user_id, symptom)) WITHOUT ROWID""",
+]
+_analytics_ready = set()
+
+
+def ensure_analytics_schema(conn, db_path=None):
+    if db_path is not None and db_path in _analytics_ready:
+        return
+    for statement in ANALYTICS_SCHEMA:
+        conn.execute(statement)
+    conn.commit()
+    if db_path is not None:
+        _analytics_ready.add(db_path)
+
+
+def normalize_symptoms(symptoms):
+    """Distinct, stripped, lower-case symptom names in their original order."""
+    if isinstance(symptoms, str):
+        symptoms = symptoms.split(",")
+    return list(dict.fromkeys(s.strip().lower() for s in symptoms if s and s.strip()))
+
+
+def _record_rollups(conn, prediction_id, user_id, symptoms, disease, day):
+    conn.executemany(
+        "INSERT INTO PredictionSymptom (prediction_id, user_id, symptom, day) VALUES (?, ?, ?, ?)",
+        [(prediction_id, user_id, s, day) for s in symptoms]
+    )
+    conn.execute(
+        "INSERT INTO DailyDiseaseCount (day, disease, count) VALUES (?, ?, 1) "
+        "ON CONFLICT (day, disease) DO UPDATE SET count = count + 1", (day, disease)
+    )
+    conn.executemany(
+        "INSERT INTO DailySymptomCount (day, symptom, count) VALUES (?, ?, 1) "
+        "ON CONFLICT (day, symptom) DO UPDATE SET count = count + 1", [(day, s) for s in symptoms]
+    )
+    if user_id is not None:
+        conn.executemany(
+            "INSERT INTO UserSymptomCount (user_id, symptom, count) VALUES (?, ?, 1) "
+            "ON CONFLICT (user_id, symptom) DO UPDATE SET count = count + 1", [(user_id, s) for s in symptoms]
+        )
+
+
+def insert_prediction(user_id, symptoms, disease, db_path=DB_PATH, timeout=5.0, matched_symptoms=None):
+    """
+    Record one disease prediction (the write done by chatbot.get_bot_response)
+    and its rollups. Prediction.symptoms keeps the user's wording; the rollups
+    count the canonical model symptoms when given, so spelling variants of one
+    symptom are counted together.
+    """
+    conn = sqlite3.connect(db_path, timeout=timeout)
+    try:
+        ensure_analytics_schema(conn, db_path)
+        with conn:  # one transaction: the prediction and its rollups land together
+            cursor = conn.execute(
+                "INSERT INTO Prediction (user_id, symptoms, predicted_disease) VALUES (?, ?, ?)",
+                (user_id, ', '.join(symptoms), disease)
+            )
+            day = datetime.now(timezone.utc).strftime("%Y-%m-%d")  # CURRENT_TIMESTAMP is UTC too
+            canonical = normalize_symptoms(symptoms if matched_symptoms is None else matched_symptoms)
+            _record_rollups(conn, cursor.lastrowid, user_id, canonical, disease, day)
+    finally:
+        conn.close()
+
+
+def backfill_analytics(db_path=DB_PATH, batch_size=5000, canonicalize=None):
+    """
+    Rebuild the side table and rollups from every existing Prediction row;
+    returns rows processed. `canonicalize` maps a row's raw symptom list to
+    canonical names (predict_helpers.match_symptoms, as the live path uses).
+    """
+    cache = {}
+
+    def canonical(raw):
+        symptoms = normalize_symptoms(raw or "")
+        if canonicalize is None:
+            return symptoms
+        key = tuple(symptoms)
+        if key not in cache:
+            cache[key] = normalize_symptoms(canonicalize(symptoms))
+        return cache[key]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_analytics_schema(conn)
+        with conn:
+            for table in ("PredictionSymptom", "DailyDiseaseCount", "DailySymptomCount", "UserSymptomCount"):
+                conn.execute(f"DELETE FROM {table}")
+            rows = conn.execute(
+                "SELECT id, user_id, symptoms, predicted_disease, date(timestamp) FROM Prediction ORDER BY id"
+            )
+            processed = 0
+            while True:
+                batch = rows.fetchmany(batch_size)
+                if not batch:
+                    break
+                conn.executemany(
+                    "INSERT INTO PredictionSymptom (prediction_id, user_id, symptom, day) VALUES (?, ?, ?, ?)",
+                    [(pid, uid, s, day) for pid, uid, symptoms, _, day in batch for s in canonical(symptoms)]
+                )
+                processed += len(batch)
+            # Rollups in one aggregate pass each instead of row-by-row upserts
+            conn.execute(
+                "INSERT INTO DailyDiseaseCount (day, disease, count) "
+                "SELECT date(timestamp), predicted_disease, COUNT(*) FROM Prediction "
+                "WHERE predicted_disease IS NOT NULL GROUP BY 1, 2"
+            )
+            conn.execute(
+                "INSERT INTO DailySymptomCount (day, symptom, count) "
+                "SELECT day, symptom, COUNT(*) FROM PredictionSymptom GROUP BY 1, 2"
+            )
+            conn.execute(
+                "INSERT INTO UserSymptomCount (user_id, symptom, count) "
+                "SELECT user_id, symptom, COUNT(*) FROM PredictionSymptom WHERE user_id IS NOT NULL GROUP BY 1, 2"
+            )
+        return processed
+    finally:
+        conn.close()
+
+
+def _since(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+
+def top_diseases(days=7, limit=10, db_path=DB_PATH):
+    """[(disease, count)] most predicted over the last `days` days (today included)."""
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT disease, SUM(count) AS n FROM DailyDiseaseCount WHERE day >= ? "
+            "GROUP BY disease ORDER BY n DESC, disease LIMIT ?", (_since(days), limit)
+        ).fetchall()
+
+
+def top_symptoms(days=7, limit=10, db_path=DB_PATH):
+    """[(symptom, count)] most reported over the last `days` days."""
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT symptom, SUM(count) AS n FROM DailySymptomCount WHERE day >= ? "
+            "GROUP BY symptom ORDER BY n DESC, symptom LIMIT ?", (_since(days), limit)
+        ).fetchall()
+
+
+def top_symptoms_for_user(user_id, limit=10, db_path=DB_PATH):
+    """[(symptom, count)] a user has reported most, all time."""
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT symptom, count FROM UserSymptomCount WHERE user_id = ? ORDER BY count DESC, symptom LIMIT ?",
+            (user_id, limit)
+        ).fetchall()
@@ -0,0 +1,194 @@
+# helpers/history_retention.py
+
+import glob
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from helpers.db_helpers import BASE_DIR, DB_PATH
+
+# Retention policy; 0 disables a limit. Both are off unless an operator sets them,
+# since archiving removes messages from the history users see in the app.
+MAX_MESSAGES_PER_USER = int(os.environ.get("MEDIBOT_HISTORY_MAX_MESSAGES", "0"))
+MAX_AGE_DAYS = int(os.environ.get("MEDIBOT_HISTORY_MAX_AGE_DAYS", "0"))
+ARCHIVE_DIR = os.environ.get("MEDIBOT_HISTORY_ARCHIVE_DIR", os.path.join(BASE_DIR, "archive", "chat_history"))
+VACUUM_PAGES = int(os.environ.get("MEDIBOT_VACUUM_PAGES", "2000"))  # freed pages returned to the OS per run
+MAINTENANCE_INTERVAL_HOURS = float(os.environ.get("MEDIBOT_MAINTENANCE_INTERVAL_HOURS", "24"))
+
+SEGMENT_PATTERN = "chat_history_*.jsonl.gz"
+HISTORY_COLUMNS = ("id", "user_id", "message_text", "sender_type", "timestamp")
+DELETE_BATCH = 500
+
+_archive_lock = threading.Lock()  # segment writes/rewrites (archive_expired, forget_user) one at a time
+
+
+def _connect(db_path, timeout=30.0):
+    return sqlite3.connect(db_path, timeout=timeout)
+
+
+def ensure_schema(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_user ON ChatHistory(user_id, timestamp)")
+    conn.execute("CREATE TABLE IF NOT EXISTS MaintenanceLog (task TEXT PRIMARY KEY, last_run TEXT NOT NULL)")
+    conn.commit()
+
+
+def enable_incremental_vacuum(conn):
+    """Switch the file to auto_vacuum=INCREMENTAL; an existing file needs one full VACUUM to convert."""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return False
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return True
+
+
+def _expired_ids(conn, max_messages, max_age_days):
+    """Ids past the age limit or beyond each user's newest `max_messages`, oldest first."""
+    clauses, params = [], []
+    if max_age_days > 0:
+        clauses.append("timestamp < datetime('now', ?)")
+        params.append(f"-{max_age_days} days")
+    if max_messages > 0:
+        clauses.append("id IN (SELECT id FROM (SELECT id, ROW_NUMBER() OVER "
+                       "(PARTITION BY user_id ORDER BY timestamp DESC, id DESC) AS n FROM ChatHistory) WHERE n > ?)")
+        params.append(max_messages)
+    if not clauses:
+        return []
+    return [i for (i,) in conn.execute(f"SELECT id FROM ChatHistory WHERE {' OR '.join(clauses)} ORDER BY id", params)]
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def archive_expired(conn, max_messages=MAX_MESSAGES_PER_USER, max_age_days=MAX_AGE_DAYS, archive_dir=ARCHIVE_DIR):
+    """Move expired rows to a new gzipped JSONL segment, then delete them; returns (rows, segment path)."""
+    with _archive_lock:
+        ids = _expired_ids(conn, max_messages, max_age_days)
+        if not ids:
+            return 0, None
+        os.makedirs(archive_dir, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        path = os.path.join(archive_dir, f"chat_history_{stamp}.jsonl.gz")
+        tmp = path + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for batch in _batches(ids, DELETE_BATCH):
+                rows = conn.execute(f"SELECT {', '.join(HISTORY_COLUMNS)} FROM ChatHistory WHERE id IN "
+                                    f"({', '.join('?' * len(batch))}) ORDER BY id", batch)
+                for row in rows:
+                    f.write(json.dumps(dict(zip(HISTORY_COLUMNS, row)), ensure_ascii=False) + "\n")
+        os.replace(tmp, path)  # the segment is complete on disk before anything is deleted
+        with conn:
+            for batch in _batches(ids, DELETE_BATCH):
+                conn.execute(f"DELETE FROM ChatHistory WHERE id IN ({', '.join('?' * len(batch))})", batch)
+        return len(ids), path
+
+
+def incremental_vacuum(conn, pages=VACUUM_PAGES):
+    """Return up to `pages` free pages to the OS; returns the free pages left."""
+    conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")  # execute() would free one page per step
+    return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def _due(conn, task, interval_hours):
+    row = conn.execute("SELECT last_run FROM MaintenanceLog WHERE task = ?", (task,)).fetchone()
+    if row is None or interval_hours <= 0:
+        return True
+    last = datetime.fromisoformat(row[0])
+    return (datetime.now(timezone.utc) - last).total_seconds() >= interval_hours * 3600
+
+
+def run_maintenance(db_path=DB_PATH, force=False, max_messages=MAX_MESSAGES_PER_USER, max_age_days=MAX_AGE_DAYS,
+                    archive_dir=ARCHIVE_DIR, vacuum_pages=VACUUM_PAGES, interval_hours=MAINTENANCE_INTERVAL_HOURS):
+    """Archive expired history and vacuum, at most once per interval unless forced; returns a summary dict or None."""
+    conn = _connect(db_path)
+    try:
+        ensure_schema(conn)
+        if not force and not _due(conn, "chat_history", interval_hours):
+            return None
+        archived, segment = archive_expired(conn, max_messages, max_age_days, archive_dir)
+        vacuumed = conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        free_pages = incremental_vacuum(conn, vacuum_pages) if vacuumed else conn.execute("PRAGMA freelist_count").fetchone()[0]
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO MaintenanceLog (task, last_run) VALUES (?, ?)",
+                         ("chat_history", datetime.now(timezone.utc).isoformat()))
+        return {"archived": archived, "segment": segment, "incremental_vacuum": vacuumed, "free_pages": free_pages}
+    finally:
+        conn.close()
+
+
+def maintain_in_background(db_path=DB_PATH):
+    """Thread target for the app: never raises, prints a one-line summary when it did something."""
+    try:
+        summary = run_maintenance(db_path)
+        if summary and summary["archived"]:
+            print(f"🗄️ Archived {summary['archived']} chat messages to {summary['segment']}")
+    except Exception as e:
+        print("⚠️ Chat history maintenance failed:", e)
+
+
+def segments(archive_dir=ARCHIVE_DIR):
+    return sorted(glob.glob(os.path.join(archive_dir, SEGMENT_PATTERN)))
+
+
+def iter_archived(user_id=None, archive_dir=ARCHIVE_DIR):
+    """Archived messages oldest segment first, one decompressed line at a time."""
+    for path in segments(archive_dir):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                if user_id is None or row["user_id"] == user_id:
+                    yield row
+
+
+def iter_history(user_id, db_path=DB_PATH, include_archived=False, batch_size=500, archive_dir=ARCHIVE_DIR):
+    """Stream a user's history as dicts in chronological order, archived rows first; nothing is loaded whole."""
+    if include_archived:
+        yield from iter_archived(user_id, archive_dir)
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(f"SELECT {', '.join(HISTORY_COLUMNS)} FROM ChatHistory WHERE user_id = ? "
+                            "ORDER BY timestamp, id", (user_id,))
+        while True:
+            batch = rows.fetchmany(batch_size)
+            if not batch:
+                break
+            for row in batch:
+                yield dict(zip(HISTORY_COLUMNS, row))
+    finally:
+        conn.close()
+
+
+def export_history(user_id, out, db_path=DB_PATH, include_archived=True, archive_dir=ARCHIVE_DIR):
+    """Write a user's history to a text stream as JSONL; returns the number of messages."""
+    count = 0
+    for count, row in enumerate(iter_history(user_id, db_path, include_archived, archive_dir=archive_dir), 1):
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return count
+
+
+def forget_user(user_id, archive_dir=ARCHIVE_DIR):
+    """Drop a user's rows from the archive segments (the archival side of clear_user_history)."""
+    with _archive_lock:
+        removed = 0
+        for path in segments(archive_dir):
+            tmp, kept, dropped = path + ".tmp", 0, 0
+            with gzip.open(path, "rt", encoding="utf-8") as src, gzip.open(tmp, "wt", encoding="utf-8") as dst:
+                for line in src:
+                    if json.loads(line)["user_id"] == user_id:
+                        dropped += 1
+                    else:
+                        dst.write(line)
+                        kept += 1
+            if not dropped:
+                os.remove(tmp)
+            elif kept:
+                os.replace(tmp, path)
+            else:
+                os.remove(tmp)
+                os.remove(path)
+            removed += dropped
+    return removed
@@ -0,0 +1,69 @@
+# helpers/image_helpers.py
+
+from collections import OrderedDict
+
+from PIL import Image
+
+FALLBACK_COLOR = "#EAEAF2"
+MIN_LEVEL_SIDE = 256  # stop halving once the shorter side would drop below this
+RENDITION_CACHE_SIZE = 8  # scaled backgrounds kept for recently used (image, size) pairs
+
+_pyramids = {}
+_renditions = OrderedDict()
+
+
+class ImagePyramid:
+    """
+    A decoded image plus successively halved copies of it. Scaling starts
+    from the smallest level that is still at least the target size, so a
+    window-sized background never resamples the full multi-megapixel source.
+    """
+
+    def __init__(self, image, min_side=MIN_LEVEL_SIDE):
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.mode or "transparency" in image.info else "RGB")
+        self.levels = [image]
+        while min(self.levels[-1].size) >= 2 * min_side:
+            self.levels.append(self.levels[-1].reduce(2))
+
+    @property
+    def size(self):
+        return self.levels[0].size
+
+    def level_for(self, width, height):
+        for level in reversed(self.levels):
+            if level.width >= width and level.height >= height:
+                return level
+        return self.levels[0]
+
+    def scaled(self, width, height):
+        return self.level_for(width, height).resize((width, height), Image.Resampling.LANCZOS)
+
+
+def load_pyramid(path):
+    """Decode an image once per process; missing files get a flat fallback colour."""
+    pyramid = _pyramids.get(path)
+    if pyramid is None:
+        try:
+            with Image.open(path) as image:
+                image.load()
+                pyramid = ImagePyramid(image)
+        except Exception:
+            print(f"Image not found: {path}. Using fallback background.")
+            pyramid = ImagePyramid(Image.new("RGB", (1, 1), color=FALLBACK_COLOR))
+        _pyramids[path] = pyramid
+    return pyramid
+
+
+def scaled_image(path, width, height):
+    """path scaled to width x height, served from a small LRU of recent renditions."""
+    key = (path, width, height)
+    image = _renditions.get(key)
+    if image is not None:
+        _renditions.move_to_end(key)
+        return image
+    image = load_pyramid(path).scaled(width, height)
+    _renditions[key] = image
+    if len(_renditions) > RENDITION_CACHE_SIZE:
+        _renditions.popitem(last=False)
+    return image
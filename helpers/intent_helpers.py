@@ -0,0 +1,83 @@
+# helpers/intent_helpers.py
+
+import os
+import pickle
+import re
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+model_path = os.path.join(BASE_DIR, "..", "intent_model.pkl")
+
+# Below this probability the ML prediction is not trusted
+CONFIDENCE_THRESHOLD = 0.45
+FALLBACK_INTENT = "general"
+
+# Whole-message phrases answered without calling the model
+FAST_PATH = {
+    "greeting": {
+        "hi", "hello", "hey", "hiya", "howdy", "namaste", "greetings", "hi there",
+        "hello there", "hey there", "good morning", "good afternoon", "good evening",
+    },
+    "thanks": {
+        "thanks", "thank you", "thank u", "thx", "ty", "cheers", "many thanks",
+        "thanks a lot", "thank you so much", "thank you very much", "much appreciated",
+    },
+    "farewell": {
+        "bye", "goodbye", "bye bye", "see you", "see ya", "see you later",
+        "take care", "good night", "exit", "quit",
+    },
+}
+fast_path_lookup = {phrase: intent for intent, phrases in FAST_PATH.items() for phrase in phrases}
+_strip_re = re.compile(r"[^a-z0-9' ]+")
+
+intent_model = None
+legacy_model = None  # older pickles stored a (model, vectorizer) tuple
+try:
+    with open(model_path, "rb") as f:
+        loaded = pickle.load(f)
+    if isinstance(loaded, tuple):
+        legacy_model = loaded
+    else:
+        intent_model = loaded
+except Exception as e:
+    print("⚠️ Error loading intent model:", e)
+
+
+def normalize(text):
+    return " ".join(_strip_re.sub(" ", text.lower()).split())
+
+
+def fast_path_intent(text):
+    return fast_path_lookup.get(normalize(text))
+
+
+def predict_intent(text):
+    """
+    Returns (intent, confidence, source) where source is "keyword", "model"
+    or "fallback".
+    """
+    intent = fast_path_intent(text)
+    if intent:
+        return intent, 1.0, "keyword"
+
+    try:
+        if intent_model is not None:
+            probs = intent_model.predict_proba([text])[0]
+            best = probs.argmax()
+            confidence = float(probs[best])
+            if confidence >= CONFIDENCE_THRESHOLD:
+                return str(intent_model.classes_[best]), confidence, "model"
+            return FALLBACK_INTENT, confidence, "fallback"
+
+        if legacy_model is not None:
+            # The threshold is tuned for the calibrated pipeline; the old
+            # uncalibrated scores sit below it even for clear symptom lists
+            model, vectorizer = legacy_model
+            return str(model.predict(vectorizer.transform([text]))[0]), 1.0, "model"
+    except Exception as e:
+        print(f"⚠️ Intent classification failed ({type(e).__name__}):", e)
+
+    return FALLBACK_INTENT, 0.0, "fallback"
+
+
+def classify_intent(text):
+    return predict_intent(text)[0]
@@ -0,0 +1,82 @@
+# helpers/medicine_alternatives.py
+
+from fuzzywuzzy import fuzz
+
+# Kept free of data loading so etl_medicines.py workers can unpickle records
+# and rank them without each re-reading the price CSV
+
+
+def extract_price(price_str):
+    try:
+        if isinstance(price_str, str):
+            return float(price_str.lower().replace("rs", "").strip())
+        elif isinstance(price_str, (int, float)):
+            return float(price_str)
+        else:
+            return float('inf')
+    except:
+        return float('inf')  # Handle missing/invalid prices by pushing them to the end
+
+
+class MedicineRecord:
+    """One row of the price CSV, pre-parsed for the alternatives scan."""
+
+    __slots__ = ("name", "name_lower", "price", "desc", "reason")
+
+    def __init__(self, name, price, desc, reason):
+        self.name = name
+        self.name_lower = str(name).lower()
+        self.price = extract_price(price)
+        self.desc = desc
+        self.reason = reason
+
+
+def build_records(frame):
+    records = []
+    reasons = {}
+    columns = [frame[c] if c in frame.columns else [None] * len(frame)
+               for c in ("Drug_Name", "Price", "Description", "Reason")]
+    for name, price, desc, reason in zip(*columns):
+        if not isinstance(name, str):
+            continue
+        # Reasons repeat across thousands of rows; keep one string per value
+        reason = reasons.setdefault(reason, reason)
+        records.append(MedicineRecord(
+            name,
+            price,
+            desc if isinstance(desc, str) else "No description available",
+            reason if isinstance(reason, str) else "Unknown reason",
+        ))
+    return records
+
+
+def rank_alternatives(medicine_name, records, top_n=5):
+    """Best-scoring similar names from records, cheapest first among equal scores."""
+    medicine_name = medicine_name.lower().strip()
+    matches = []
+
+    for record in records:
+        score = fuzz.token_sort_ratio(medicine_name, record.name_lower)
+
+        if score > 60:
+            matches.append({
+                "name": record.name,
+                "score": score,
+                "price": record.price,
+                "desc": record.desc,
+                "reason": record.reason
+            })
+
+    # Sort first by descending similarity score, then ascending price
+    matches = sorted(matches, key=lambda x: (-x["score"], x["price"]))
+
+    # Skip exact match and get top_n alternatives
+    filtered = []
+    for match in matches:
+    # Exclude exact or near-exact matches (similarity >= 95)
+          if fuzz.token_sort_ratio(medicine_name, match["name"].lower()) < 95:
+               filtered.append(match)
+          if len(filtered) == top_n:
+               break
+
+    return filtered
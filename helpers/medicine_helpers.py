@@ -1,71 +1,104 @@
 import pandas as pd
 from difflib import get_close_matches
-import re
 import os
 
+from helpers import query_parser as qp
+from helpers import memory_helpers as memh
+from helpers import name_index as ni
+from helpers import composition_index as ci
+from helpers import medicine_store as ms
+
 # Load and normalize medicine data
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 excel_path = os.path.join(BASE_DIR, "..", "assets", "MID.xlsx")
 
-try:
-    df = pd.read_excel(excel_path)
-    df.columns = df.columns.str.strip().str.lower()
-    df["name"] = df["name"].astype(str).str.strip().str.lower()
-except Exception as e:
-    print("❌ Error loading MID.xlsx:", e)
-    df = pd.DataFrame()  # fallback empty
+def load_catalogue(path=excel_path):
+    """MID.xlsx with lower-cased column names and medicine names."""
+    catalogue = pd.read_excel(path)
+    catalogue.columns = catalogue.columns.str.strip().str.lower()
+    catalogue["name"] = catalogue["name"].astype(str).str.strip().str.lower()
+    return catalogue
+
+
+if ms.BACKEND == "sqlite":
+    df = pd.DataFrame()  # records are read from SQLite one at a time
+    names = ms.load_names()
+else:
+    try:
+        df = load_catalogue()
+        names = df["name"].dropna().unique().tolist()
+        if memh.COMPACT:
+            df = memh.compact_frame(df)
+    except Exception as e:
+        print("❌ Error loading MID.xlsx:", e)
+        df = pd.DataFrame()  # fallback empty
+        names = []
+name_set = set(names)
+_name_index = None
+_composition_index = None
 
 # ----------------------------------------
 
-def extract_medicine_name(query):
-    keywords = [
-        "uses", "side effects", "composition", "manufacturer", "how to use",
-        "how does it work", "benefits", "safety", "habit forming", "class",
-        "product information", "info", "information", "details", "tablet", "syrup", "capsule"
-    ]
-    cleaned = query.lower()
-    for kw in keywords:
-        cleaned = cleaned.replace(kw, "")
+def get_name_index():
+    """Phonetic/deletion index over the catalogue names, built on first use."""
+    global _name_index
+    if _name_index is None:
+        _name_index = ni.NameIndex(names)
+    return _name_index
+
+
+def get_composition_index():
+    """Products grouped by canonical composition, built on first use."""
+    global _composition_index
+    if _composition_index is None:
+        contains = df["contains"] if "contains" in df.columns else [None] * len(df)
+        _composition_index = ci.CompositionIndex(df["name"] if "name" in df.columns else [], contains)
+    return _composition_index
+
 
-    cleaned = re.sub(r"[^a-zA-Z0-9\s]", "", cleaned)
-    return cleaned.strip()
+def find_exact_substitutes(medicine_name, top_n=10):
+    """Catalogue products with exactly the same salts and strengths, as display lines."""
+    if ms.BACKEND == "sqlite":
+        found = ms.substitutes(medicine_name, top_n)
+    else:
+        found = get_composition_index().substitutes(medicine_name)[:top_n]
+    result_lines = []
+    for name in found:
+        result_lines.append(f"💊 {name.title()}")
+    return result_lines
+
+
+def extract_medicine_name(query):
+    return qp.parse_query(query).medicine_name
 
 
 def find_best_match(name):
-    names = df["name"].dropna().unique().tolist()
-    extracted = extract_medicine_name(name)
+    # Already a catalogue name (e.g. resolved by chatbot.find_best_match)
+    if name in name_set:
+        return name
 
-    if extracted in names:
+    extracted = extract_medicine_name(name)
+    if extracted in name_set:
         return extracted
 
+    indexed = get_name_index().lookup(extracted)
+    if indexed:
+        return indexed
+
     matches = get_close_matches(extracted, names, n=1, cutoff=0.6)
     return matches[0] if matches else None
 
+
 def get_info_type(query):
-    query = query.lower()
-
-    if any(x in query for x in ["how to use", "how do i take", "usage", "take"]):
-        return "howtouse"
-    elif any(x in query for x in ["side effect", "sideeffects", "adverse"]):
-        return "sideeffect"
-    elif "benefit" in query:
-        return "productbenefits"
-    elif "safety" in query or "safe" in query:
-        return "safetyadvice"
-    elif "habit" in query or "addictive" in query:
-        return "habit_forming"
-    elif "chemical" in query:
-        return "chemical_class"
-    elif "therapeutic" in query:
-        return "therapeutic_class"
-    elif "action" in query:
-        return "action_class"
-    elif "composition" in query or "contains" in query:
-        return "contains"
-    elif "product" in query or "introduction" in query:
-        return "productintroduction"
-    else:
-        return None
+    return qp.parse_query(query).info_type
+
+
+def get_medicine_record(name):
+    """The MID row for a catalogue name, or None."""
+    if ms.BACKEND == "sqlite":
+        return ms.get_record(name)
+    rows = df[df["name"] == name]
+    return rows.iloc[0] if not rows.empty else None
 
 
 def search_medicine(query, info_type=None):
@@ -74,7 +107,11 @@ def search_medicine(query, info_type=None):
     if not matched:
         return "❌ Sorry, couldn't identify that medicine."
 
-    row = df[df["name"] == matched].iloc[0]
+    return format_medicine_info(get_medicine_record(matched), info_type)
+
+
+def format_medicine_info(row, info_type=None):
+    """Answer for one MID row: the requested field, or the full summary."""
     name = row["name"].title()
     contains = row.get("contains", "N/A")
 
@@ -89,12 +126,13 @@ def search_medicine(query, info_type=None):
         "therapeutic_class": "therapeutic_class",
         "action_class": "action_class",
         "contains": "contains",
+        "productuses": "productuses",
         "productintroduction": "productintroduction"
     }
 
     if info_type:
         col = info_map.get(info_type)
-        if col and col in df.columns:
+        if col and col in row:
             value = row.get(col, "")
             if value and str(value).strip():
                 if col == "contains":
@@ -0,0 +1,108 @@
+# helpers/medicine_store.py
+
+import os
+import pathlib
+import sqlite3
+import threading
+
+from helpers.db_helpers import DB_PATH
+
+# MEDIBOT_DATA_BACKEND=sqlite serves medicine lookups from the tables filled by
+# etl_medicines.py instead of loading MID.xlsx and the price CSV into pandas
+BACKEND = os.environ.get("MEDIBOT_DATA_BACKEND", "pandas")
+STORE_PATH = os.environ.get("MEDIBOT_MEDICINE_DB", DB_PATH)
+
+# MID column -> MedicineInfo column (the first four are the init_db.py originals)
+MEDICINE_COLUMNS = {
+    "name": "medicine_name",
+    "productuses": "uses",
+    "sideeffect": "side_effects",
+    "safetyadvice": "precautions",
+    "contains": "contains",
+    "howtouse": "howtouse",
+    "productbenefits": "productbenefits",
+    "habit_forming": "habit_forming",
+    "chemical_class": "chemical_class",
+    "therapeutic_class": "therapeutic_class",
+    "action_class": "action_class",
+    "productintroduction": "productintroduction",
+}
+EXTRA_COLUMNS = {
+    "MedicineInfo": ["contains", "howtouse", "productbenefits", "habit_forming", "chemical_class",
+                     "therapeutic_class", "action_class", "productintroduction", "composition_key"],
+    "AlternativeMedicine": ["rank INTEGER", "score INTEGER", "price REAL", "description TEXT", "reason TEXT"],
+}
+
+_local = threading.local()
+
+
+def ensure_schema(conn):
+    """Create the medicine tables (init_db.py layout) and add the columns the ETL fills."""
+    conn.execute("""CREATE TABLE IF NOT EXISTS MedicineInfo (
+        medicine_id INTEGER PRIMARY KEY AUTOINCREMENT, medicine_name TEXT,
+        uses TEXT, side_effects TEXT, precautions TEXT)""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS AlternativeMedicine (
+        alt_id INTEGER PRIMARY KEY AUTOINCREMENT, medicine_id INTEGER, alternative_name TEXT,
+        FOREIGN KEY (medicine_id) REFERENCES MedicineInfo(medicine_id))""")
+    for table, columns in EXTRA_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column in columns:
+            if column.split()[0] not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+    conn.commit()
+
+
+def create_indexes(conn):
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_medicine_name ON MedicineInfo(medicine_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_medicine_composition ON MedicineInfo(composition_key)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_alternative_medicine ON AlternativeMedicine(medicine_id, rank)")
+    conn.commit()
+
+
+def _connection():
+    """One read-only connection per thread."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        # as_uri() percent-encodes '?', '#' and spaces that would otherwise end or break the path
+        conn = sqlite3.connect(pathlib.Path(STORE_PATH).resolve().as_uri() + "?mode=ro", uri=True,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        _local.conn = conn
+    return conn
+
+
+def load_names():
+    try:
+        return [name for (name,) in _connection().execute("SELECT medicine_name FROM MedicineInfo ORDER BY medicine_id")]
+    except sqlite3.Error as e:
+        print("❌ Error loading medicines from SQLite (run etl_medicines.py first):", e)
+        return []
+
+
+def get_record(name):
+    """MID-shaped dict for a catalogue name (keys as in MID.xlsx), or None."""
+    row = _connection().execute("SELECT * FROM MedicineInfo WHERE medicine_name = ?", (name,)).fetchone()
+    if row is None:
+        return None
+    return {mid_col: row[col] for mid_col, col in MEDICINE_COLUMNS.items()}
+
+
+def substitutes(name, top_n=10):
+    rows = _connection().execute(
+        "SELECT other.medicine_name FROM MedicineInfo AS m "
+        "JOIN MedicineInfo AS other ON other.composition_key = m.composition_key AND other.medicine_id != m.medicine_id "
+        "WHERE m.medicine_name = ? AND m.composition_key != '' ORDER BY other.medicine_id LIMIT ?",
+        (name, top_n),
+    )
+    return [other for (other,) in rows]
+
+
+def alternatives(name, top_n=5):
+    """Precomputed alternatives as find_alternative_medicines match dicts, best first."""
+    rows = _connection().execute(
+        "SELECT a.alternative_name, a.score, a.price, a.description, a.reason FROM AlternativeMedicine AS a "
+        "JOIN MedicineInfo AS m ON m.medicine_id = a.medicine_id WHERE m.medicine_name = ? ORDER BY a.rank LIMIT ?",
+        (name, top_n),
+    )
+    return [{"name": r[0], "score": r[1], "price": float("inf") if r[2] is None else r[2], "desc": r[3], "reason": r[4]}
+            for r in rows]
@@ -0,0 +1,118 @@
+# helpers/memory_helpers.py
+
+import os
+import pickle
+import sys
+
+# MEDIBOT_COMPACT=1 trades a little load time for a smaller resident footprint
+COMPACT = os.environ.get("MEDIBOT_COMPACT", "0") == "1"
+CATEGORY_RATIO = 0.5  # object columns with fewer unique values than this share become categories
+
+# (label, module, attributes) measured by component_sizes()
+COMPONENTS = [
+    ("disease model", "helpers.predict_helpers", ["model", "le", "X_columns"]),
+    ("disease tables", "helpers.predict_helpers",
+     ["desc_df", "medications_df", "precautions_df", "workout_df", "diets_df"]),
+    ("symptom profiles", "helpers.predict_helpers",
+     ["profile_matrix", "symptom_index", "valid_symptoms"]),
+    ("symptom bitsets", "helpers.symptom_index", ["diseases", "symptom_bits"]),
+    ("MID catalogue", "helpers.medicine_helpers", ["df", "names", "name_set"]),
+    ("medicine prices", "helpers.example_medicine_helper", ["medicine_records"]),
+    ("intent model", "helpers.intent_helpers", ["intent_model", "legacy_model"]),
+]
+# spaCy pipelines don't size well this way; the import delta in
+# benchmarks/memory_report.py covers them
+
+
+def rss_bytes():
+    """Current resident set size of this process (peak RSS where current is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return 0
+
+
+def is_unused_column(name):
+    """Index columns written by to_csv() without index=False."""
+    name = str(name)
+    return name.startswith("Unnamed") or name == "" or name == "index"
+
+
+def compact_frame(df, category_ratio=CATEGORY_RATIO):
+    """
+    Smaller copy of df: index columns dropped, repetitive text columns turned
+    into categories and the remaining strings interned so equal values share
+    one object.
+    """
+    if df is None or df.empty:
+        return df
+    df = df.drop(columns=[c for c in df.columns if is_unused_column(c)])
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        if df[col].nunique(dropna=True) <= category_ratio * len(df):
+            df[col] = df[col].astype("category")
+        else:
+            df[col] = df[col].map(lambda v: sys.intern(v) if isinstance(v, str) else v)
+    return df
+
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate bytes held by obj, following containers, frames and arrays."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if hasattr(obj, "memory_usage") and hasattr(obj, "columns"):  # DataFrame
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if hasattr(obj, "nbytes") and hasattr(obj, "dtype"):  # numpy array
+        return int(obj.nbytes)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_sizeof(v, seen) for v in obj)
+    if hasattr(obj, "__slots__"):
+        return sys.getsizeof(obj) + sum(deep_sizeof(getattr(obj, s, None), seen) for s in obj.__slots__)
+    # Models and pipelines: the pickled size is a reasonable stand-in
+    try:
+        return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(obj)
+
+
+def component_sizes():
+    """[(label, bytes)] for every component whose module is already imported."""
+    sizes = []
+    for label, module_name, attrs in COMPONENTS:
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        seen = set()
+        total = sum(deep_sizeof(getattr(module, a), seen) for a in attrs if getattr(module, a, None) is not None)
+        sizes.append((label, total))
+    return sizes
+
+
+def format_report(sizes=None):
+    sizes = component_sizes() if sizes is None else sizes
+    lines = [f"🧠 RSS {rss_bytes() / 1e6:.1f} MB (compact mode {'on' if COMPACT else 'off'})"]
+    for label, size in sorted(sizes, key=lambda item: -item[1]):
+        lines.append(f"  {label:<20}{size / 1e6:>9.2f} MB")
+    return "\n".join(lines)
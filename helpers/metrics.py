@@ -0,0 +1,219 @@
+# helpers/metrics.py
+
+import bisect
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Latency buckets in seconds (Prometheus histogram "le" bounds)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SAMPLE_SIZE = 2048  # recent samples kept per stage for percentiles
+
+TRACE_FILE = os.environ.get("MEDIBOT_TRACE_FILE")  # JSONL, one line per request
+METRICS_PORT = os.environ.get("MEDIBOT_METRICS_PORT")
+ENABLED = os.environ.get("MEDIBOT_METRICS", "1") != "0"
+
+_current_trace = contextvars.ContextVar("medibot_trace", default=None)
+_trace_lock = threading.Lock()
+
+# thread id -> stack of open stage names; only maintained while a profiler asks
+_track_threads = False
+_thread_stages = {}
+
+
+class Histogram:
+    """Cumulative bucket counts plus a bounded reservoir of samples for percentiles."""
+
+    __slots__ = ("counts", "count", "total", "samples", "lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self.lock:
+            self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            if len(self.samples) < SAMPLE_SIZE:
+                self.samples.append(seconds)
+            elif random.random() < SAMPLE_SIZE / self.count:
+                # Reservoir sampling keeps old and new requests equally represented
+                self.samples[random.randrange(SAMPLE_SIZE)] = seconds
+
+    def percentiles(self, qs=(50, 95, 99)):
+        with self.lock:
+            data = sorted(self.samples)
+        if not data:
+            return {q: 0.0 for q in qs}
+        return {q: data[min(len(data) - 1, int(len(data) * q / 100))] for q in qs}
+
+
+histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def histogram(name):
+    h = histograms.get(name)
+    if h is None:
+        with _histograms_lock:
+            h = histograms.setdefault(name, Histogram())
+    return h
+
+
+def observe(name, seconds):
+    histogram(name).observe(seconds)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace["stages"].append((name, round(seconds * 1000, 3)))
+
+
+@contextmanager
+def stage(name):
+    """Time a block as one pipeline stage of the current request."""
+    if not ENABLED:
+        yield
+        return
+    tracked = _track_threads
+    if tracked:
+        _thread_stages.setdefault(threading.get_ident(), []).append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+        if tracked:
+            stack = _thread_stages.get(threading.get_ident())
+            if stack:
+                stack.pop()
+
+
+def timed(name=None):
+    """Decorator form of stage(); defaults to the function name."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def trace(name, **attrs):
+    """
+    Open a per-request trace: stages recorded inside it share one trace id,
+    and the whole trace is appended to MEDIBOT_TRACE_FILE if set.
+    """
+    if not ENABLED:
+        yield None
+        return
+    record = {"trace_id": uuid.uuid4().hex[:16], "name": name, "ts": time.time(), "stages": []}
+    record.update(attrs)
+    token = _current_trace.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        _current_trace.reset(token)
+        elapsed = time.perf_counter() - start
+        histogram(name).observe(elapsed)
+        record["total_ms"] = round(elapsed * 1000, 3)
+        if TRACE_FILE:
+            write_trace(record)
+
+
+def track_thread_stages(enabled):
+    """Let samplers see which stage each thread is in (see current_stage)."""
+    global _track_threads
+    _track_threads = enabled
+    if not enabled:
+        _thread_stages.clear()
+
+
+def current_stage(thread_id):
+    stack = _thread_stages.get(thread_id)
+    return stack[-1] if stack else None
+
+
+def current_trace_id():
+    trace_record = _current_trace.get()
+    return trace_record["trace_id"] if trace_record else None
+
+
+def write_trace(record, path=None):
+    line = json.dumps(record, ensure_ascii=False)
+    with _trace_lock:
+        with open(path or TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def summary():
+    """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms}}"""
+    result = {}
+    for name, h in sorted(histograms.items()):
+        p = h.percentiles()
+        result[name] = {
+            "count": h.count,
+            "mean_ms": round(h.total / h.count * 1000, 3) if h.count else 0.0,
+            "p50_ms": round(p[50] * 1000, 3),
+            "p95_ms": round(p[95] * 1000, 3),
+            "p99_ms": round(p[99] * 1000, 3),
+        }
+    return result
+
+
+def render_prometheus():
+    lines = ["# HELP medibot_stage_seconds Time spent per pipeline stage.",
+             "# TYPE medibot_stage_seconds histogram"]
+    for name, h in sorted(histograms.items()):
+        with h.lock:
+            counts, count, total = list(h.counts), h.count, h.total
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(f'medibot_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'medibot_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {count}')
+        lines.append(f'medibot_stage_seconds_sum{{stage="{name}"}} {total:.6f}')
+        lines.append(f'medibot_stage_seconds_count{{stage="{name}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = render_prometheus().encode(), "text/plain; version=0.0.4"
+        elif self.path == "/summary":
+            body, content_type = json.dumps(summary(), indent=2).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    """Expose /metrics (Prometheus text) and /summary (JSON) on a daemon thread."""
+    server = HTTPServer((host, int(port)), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"📈 Metrics available at http://{host}:{port}/metrics")
+    return server
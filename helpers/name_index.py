@@ -0,0 +1,330 @@
+# helpers/name_index.py
+
+import re
+from difflib import SequenceMatcher
+
+UNITS = {"zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9}
+TEENS = {"ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15,
+         "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19}
+TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90}
+
+# Dosage forms and units users leave out ("dolo 650" for "dolo 650 tablet")
+FORM_WORDS = {
+    "tablet", "tablets", "tab", "capsule", "capsules", "cap", "syrup", "suspension", "injection",
+    "cream", "gel", "ointment", "drops", "drop", "solution", "lotion", "spray", "powder", "sachet",
+    "inhaler", "respules", "er", "sr", "xr", "cr", "mr", "dt", "mg", "ml", "mcg", "gm", "g", "iu",
+}
+MAX_EDIT = 2  # phonetic-key edit distance accepted after a deletion-index hit
+PREFIX_LENGTH = 8  # SymSpell prefix: only the first characters of a key go into the deletion index
+MAX_CANDIDATES = 50
+MIN_KEY_LENGTH = 3  # shorter query keys ("HL" for hello/hilo, "FR" for fever) match too much to trust
+MIN_RATIO = 0.6  # same cutoff as the get_close_matches fallback
+
+_run_re = re.compile(r"[a-z]+|[0-9]+")
+_vowels = set("aeiouy")
+
+
+def normalize_spoken_numbers(text):
+    """
+    Turn spelled-out numbers into digits the way strengths are spoken:
+    "six fifty" -> "650", "one twenty five" -> "125", "two hundred and fifty" -> "250".
+    """
+    out = []
+    groups = []  # digit groups of the number being read, concatenated on flush
+    current = None
+    last = None
+
+    def flush():
+        nonlocal current, last
+        if current is not None:
+            groups.append(current)
+        if groups:
+            out.append("".join(str(g) for g in groups))
+            groups.clear()
+        current, last = None, None
+
+    def start(value, kind):
+        nonlocal current, last
+        if current is not None:
+            groups.append(current)
+        current, last = value, kind
+
+    for word in text.split():
+        joins = last in ("hundred", "thousand", "and")
+        if word in UNITS:
+            if (last == "tens" and current % 10 == 0) or joins:
+                current += UNITS[word]
+                last = "unit"
+            else:
+                start(UNITS[word], "unit")
+        elif word in TEENS:
+            if joins:
+                current += TEENS[word]
+                last = "teen"
+            else:
+                start(TEENS[word], "teen")
+        elif word in TENS:
+            if joins:
+                current += TENS[word]
+                last = "tens"
+            else:
+                start(TENS[word], "tens")
+        elif word == "hundred":
+            if current is None:
+                start(100, "hundred")
+            else:
+                current = current // 1000 * 1000 + (current % 1000 or 1) * 100
+                last = "hundred"
+        elif word == "thousand":
+            if current is None:
+                start(1000, "thousand")
+            else:
+                current = (current or 1) * 1000
+                last = "thousand"
+        elif word == "and" and last in ("hundred", "thousand"):
+            last = "and"
+        else:
+            flush()
+            out.append(word)
+    flush()
+    return " ".join(out)
+
+
+def phonetic_keys(word):
+    """
+    (primary, alternate) Double Metaphone-style keys for a lower-case
+    alphabetic word. Sounds that are commonly spelled several ways map to
+    one code (ph/f, c/k/q, z/s, b/p, d/t, v/f); the alternate key covers the
+    ambiguous cases (hard "ch", hard "g", "th" as t).
+    """
+    primary, alternate = [], []
+
+    def add(p, a=None):
+        primary.append(p)
+        alternate.append(p if a is None else a)
+
+    w = word
+    n = len(w)
+    i = 0
+    if w[:2] in ("kn", "gn", "pn", "wr", "ps"):
+        i = 1
+    elif w[:1] == "x":
+        add("S")
+        i = 1
+    while i < n:
+        c = w[i]
+        nxt = w[i + 1] if i + 1 < n else ""
+        if c == w[i - 1:i] and c != "c":
+            i += 1
+            continue
+        if c in _vowels:
+            if i == 0:
+                add("A")
+        elif c == "b":
+            add("P")
+        elif c == "c":
+            if nxt == "h":
+                add("X", "K")
+                i += 1
+            elif nxt in ("i", "e", "y"):
+                add("S")
+            else:
+                add("K")
+                if nxt in ("k", "q"):
+                    i += 1
+        elif c == "d":
+            if nxt == "g" and w[i + 2:i + 3] in ("e", "i", "y"):
+                add("J")
+                i += 1
+            else:
+                add("T")
+        elif c in ("f", "v"):
+            add("F")
+        elif c == "g":
+            if nxt == "h":
+                if i == 0:
+                    add("K")
+                i += 1
+            elif nxt == "n":
+                pass
+            elif nxt in ("e", "i", "y"):
+                add("J", "K")
+            else:
+                add("K")
+        elif c == "h":
+            if (i == 0 or w[i - 1] in _vowels) and nxt in _vowels:
+                add("H")
+        elif c == "j":
+            add("J")
+        elif c in ("k", "q"):
+            add("K")
+        elif c == "p":
+            if nxt == "h":
+                add("F")
+                i += 1
+            else:
+                add("P")
+        elif c == "s":
+            if nxt == "h":
+                add("X")
+                i += 1
+            elif w[i + 1:i + 3] == "ch":
+                add("SK")
+                i += 2
+            elif w[i + 1:i + 3] in ("io", "ia"):
+                add("S", "X")
+            else:
+                add("S")
+        elif c == "t":
+            if nxt == "h":
+                add("0", "T")
+                i += 1
+            elif w[i + 1:i + 3] in ("io", "ia"):
+                add("X")
+            else:
+                add("T")
+        elif c == "w":
+            if nxt in _vowels:
+                add("W")
+        elif c == "x":
+            add("KS")
+        elif c == "z":
+            add("S")
+        elif c in "lmnr":
+            add(c.upper())
+        i += 1
+    return _collapse(primary), _collapse(alternate)
+
+
+def _collapse(codes):
+    out = []
+    for code in "".join(codes):
+        if not out or out[-1] != code:
+            out.append(code)
+    return "".join(out)
+
+
+def name_terms(text):
+    """Words of a name without dosage forms and units, numbers spoken or written."""
+    return [w for w in normalize_spoken_numbers(text.lower()).split() if w not in FORM_WORDS]
+
+
+def name_keys(text):
+    """
+    Phonetic keys for a whole name. Words are joined first so "azithro mycin"
+    and "azithromycin" agree; digit runs (strengths) are kept verbatim.
+    """
+    compact = "".join(name_terms(text))
+    primary, alternate = [], []
+    for run in _run_re.findall(compact):
+        if run.isdigit():
+            primary.append(run)
+            alternate.append(run)
+        else:
+            p, a = phonetic_keys(run)
+            primary.append(p)
+            alternate.append(a)
+    return "".join(primary), "".join(alternate)
+
+
+def brand_key(text):
+    """Phonetic key of the first word's letters, for queries without a strength or variant."""
+    terms = name_terms(text)
+    match = _run_re.match(terms[0]) if terms else None
+    return phonetic_keys(match.group())[0] if match and not match.group().isdigit() else ""
+
+
+def _deletes(key, max_edit=1):
+    """key (cut to PREFIX_LENGTH) plus every variant with up to max_edit characters deleted."""
+    key = key[:PREFIX_LENGTH]
+    result = {key}
+    frontier = {key}
+    for _ in range(max_edit):
+        frontier = {k[:i] + k[i + 1:] for k in frontier for i in range(len(k))}
+        result |= frontier
+    return result
+
+
+def edit_distance(a, b, limit=MAX_EDIT):
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        row = [i]
+        for j, cb in enumerate(b, 1):
+            row.append(min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(row) > limit:
+            return limit + 1
+        previous = row
+    return previous[-1]
+
+
+class NameIndex:
+    """
+    Hashed lookups from a spoken or misspelled medicine name to catalogue
+    names: exact compact spelling, then phonetic key, then a SymSpell-style
+    deletion index over phonetic keys, then the brand alone.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.exact = {}
+        self.by_key = {}
+        self.by_brand = {}
+        self.deletes = {}
+        for i, name in enumerate(self.names):
+            self.exact.setdefault("".join(name_terms(name)), i)
+            primary, alternate = name_keys(name)
+            for key in {primary, alternate}:
+                if key:
+                    self.by_key.setdefault(key, []).append(i)
+            brand = brand_key(name)
+            if brand:
+                self.by_brand.setdefault(brand, []).append(i)
+        for key in self.by_key:
+            for d in _deletes(key):
+                self.deletes.setdefault(d, []).append(key)
+
+    def candidates(self, text):
+        """Catalogue indices for text from the first index layer that has any."""
+        compact = "".join(name_terms(text))
+        if not compact:
+            return []
+        if compact in self.exact:
+            return [self.exact[compact]]
+
+        primary, alternate = name_keys(text)
+        if len(primary) < MIN_KEY_LENGTH:
+            return []
+        found = [i for key in {primary, alternate} for i in self.by_key.get(key, ())]
+        if found:
+            return found
+
+        limit = 1 if len(primary) <= 4 else MAX_EDIT
+        keys = {key for d in _deletes(primary) for key in self.deletes.get(d, ())}
+        # Strengths trail the key, so compare the same prefix the deletion index holds
+        prefix = primary[:PREFIX_LENGTH]
+        found = [i for key in keys if edit_distance(prefix, key[:PREFIX_LENGTH], limit) <= limit
+                 for i in self.by_key[key]]
+        if found:
+            return found
+        return list(self.by_brand.get(brand_key(text), ()))
+
+    def similarity(self, text, name):
+        """
+        SequenceMatcher ratio of the spoken terms against the name's leading
+        terms (pack sizes and forms users leave out don't count against it).
+        """
+        spoken = name_terms(text)
+        terms = name_terms(name)
+        return SequenceMatcher(None, " ".join(spoken), " ".join(terms[:len(spoken)])).ratio()
+
+    def lookup(self, text, min_ratio=MIN_RATIO):
+        """Best catalogue name for text, or None if no layer matched or the best is below min_ratio."""
+        found = self.candidates(text)
+        if not found:
+            return None
+        scored = [(self.similarity(text, self.names[i]), -n, i) for n, i in enumerate(dict.fromkeys(found[:MAX_CANDIDATES]))]
+        ratio, _, best = max(scored)
+        return self.names[best] if ratio >= min_ratio else None
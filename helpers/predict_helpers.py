@@ -4,6 +4,8 @@ import joblib
 import re
 import ast
 from difflib import get_close_matches #fuzzy matching
+from helpers import metrics
+from helpers import memory_helpers as memh
 
 # Load the trained model and label encoder
 model = joblib.load("model/model.pkl")
@@ -13,8 +15,9 @@ X_columns = joblib.load("model/X_columns.pkl")  # list of symptom feature names
 # Load all data files
 desc_df = pd.read_csv("data/description.csv")
 medications_df = pd.read_csv("data/medications.csv")
-precautions_df = pd.read_csv("data/precautions_df.csv")
-workout_df = pd.read_csv("data/workout_df.csv")
+# The leading columns of these two files are leftover to_csv() indexes
+precautions_df = pd.read_csv("data/precautions_df.csv", usecols=lambda c: not memh.is_unused_column(c))
+workout_df = pd.read_csv("data/workout_df.csv", usecols=lambda c: not memh.is_unused_column(c))
 diets_df = pd.read_csv("data/diets.csv")
 
 # Clean disease columns
@@ -23,45 +26,38 @@ medications_df['Disease'] = medications_df['Disease'].astype(str).str.strip().st
 precautions_df['Disease'] = precautions_df['Disease'].astype(str).str.strip().str.lower()
 workout_df.columns = workout_df.columns.str.strip().str.lower()
 diets_df.columns = diets_df.columns.str.strip().str.lower()
+precaution_cols = [c for c in precautions_df.columns if c.startswith("Precaution")]
 
-# Create a valid symptom list for validation
-valid_symptoms = {
-    'itching', 'skin_rash', 'nodal_skin_eruptions', 'continuous_sneezing', 'shivering', 'chills',
- 'joint_pain', 'stomach_pain', 'acidity', 'ulcers_on_tongue', 'muscle_wasting', 'vomiting',
- 'burning_micturition', 'spotting_ urination', 'fatigue', 'weight_gain', 'anxiety',
- 'cold_hands_and_feets', 'mood_swings', 'weight_loss', 'restlessness', 'lethargy',
- 'patches_in_throat', 'irregular_sugar_level', 'cough', 'high_fever', 'sunken_eyes',
- 'breathlessness', 'sweating', 'dehydration', 'indigestion', 'headache', 'yellowish_skin',
- 'dark_urine', 'nausea', 'loss_of_appetite', 'pain_behind_the_eyes', 'back_pain',
- 'constipation', 'abdominal_pain', 'diarrhoea', 'mild_fever', 'yellow_urine',
- 'yellowing_of_eyes', 'acute_liver_failure', 'fluid_overload', 'swelling_of_stomach',
- 'swelled_lymph_nodes', 'malaise', 'blurred_and_distorted_vision', 'phlegm',
- 'throat_irritation', 'redness_of_eyes', 'sinus_pressure', 'runny_nose', 'congestion',
- 'chest_pain', 'weakness_in_limbs', 'fast_heart_rate', 'pain_during_bowel_movements',
- 'pain_in_anal_region', 'bloody_stool', 'irritation_in_anus', 'neck_pain', 'dizziness',
- 'cramps', 'bruising', 'obesity', 'swollen_legs', 'swollen_blood_vessels',
- 'puffy_face_and_eyes', 'enlarged_thyroid', 'brittle_nails', 'swollen_extremeties',
- 'excessive_hunger', 'extra_marital_contacts', 'drying_and_tingling_lips', 'slurred_speech',
- 'knee_pain', 'hip_joint_pain', 'muscle_weakness', 'stiff_neck', 'swelling_joints',
- 'movement_stiffness', 'spinning_movements', 'loss_of_balance', 'unsteadiness',
- 'weakness_of_one_body_side', 'loss_of_smell', 'bladder_discomfort', 'foul_smell_of urine',
- 'continuous_feel_of_urine', 'passage_of_gases', 'internal_itching', 'toxic_look_(typhos)',
- 'depression', 'irritability', 'muscle_pain', 'altered_sensorium', 'red_spots_over_body',
- 'belly_pain', 'abnormal_menstruation', 'dischromic _patches', 'watering_from_eyes',
- 'increased_appetite', 'polyuria', 'family_history', 'mucoid_sputum', 'rusty_sputum',
- 'lack_of_concentration', 'visual_disturbances', 'receiving_blood_transfusion',
- 'receiving_unsterile_injections', 'coma', 'stomach_bleeding', 'distention_of_abdomen',
- 'history_of_alcohol_consumption', 'fluid_overload.1', 'blood_in_sputum',
- 'prominent_veins_on_calf', 'palpitations', 'painful_walking', 'pus_filled_pimples',
- 'blackheads', 'scurring', 'skin_peeling', 'silver_like_dusting', 'small_dents_in_nails',
- 'inflammatory_nails', 'blister', 'red_sore_around_nose', 'yellow_crust_ooze', 'prognosis'
-}
+# Disease -> symptom profiles, used to count how many of the user's symptoms
+# each candidate disease actually explains
+symptoms_df = pd.read_csv("data/symtoms_df.csv")
+symptom_cols = [c for c in symptoms_df.columns if c.startswith("Symptom")]
+symptom_index = {col.lower(): i for i, col in enumerate(X_columns)}
+valid_symptoms = symptom_index.keys()  # shares the keys instead of a second copy
 
-def predict_disease(symptom_list):
-    input_vector = [0] * len(X_columns)
-    symptoms = [col.lower() for col in X_columns]
+profile_matrix = np.zeros((len(le.classes_), len(X_columns)), dtype=np.uint8)
+class_index = {str(name).strip().lower(): i for i, name in enumerate(le.classes_)}
+for _, row in symptoms_df.iterrows():
+    cls = class_index.get(str(row["Disease"]).strip().lower())
+    if cls is None:
+        continue
+    for col in symptom_cols:
+        sym = row[col]
+        if isinstance(sym, str) and sym.strip().lower() in symptom_index:
+            profile_matrix[cls, symptom_index[sym.strip().lower()]] = 1
+profile_sizes = profile_matrix.sum(axis=1)
+symptoms_df = None  # only needed to build profile_matrix
+
+if memh.COMPACT:
+    desc_df, medications_df, precautions_df, workout_df, diets_df = (
+        memh.compact_frame(frame) for frame in (desc_df, medications_df, precautions_df, workout_df, diets_df))
 
-    valid_input_found = False
+
+def match_symptoms(symptom_list):
+    """
+    Map free-text symptoms onto the canonical symptom names used by the model.
+    """
+    matched = []
     for symptom in symptom_list:
         # Try direct match first
         if symptom in valid_symptoms:
@@ -76,18 +72,80 @@ def predict_disease(symptom_list):
                 print(f"⚠️ Warning: '{symptom}' is not recognized.")
                 continue
 
-        if match in symptoms:
-            input_vector[symptoms.index(match)] = 1
-            valid_input_found = True
+        if match in symptom_index and match not in matched:
+            matched.append(match)
+    return matched
+
 
-    if not valid_input_found:
+def build_input_vector(symptom_list):
+    """
+    Build the model's feature vector from free-text symptoms.
+    Returns None if none of the symptoms could be recognised.
+    """
+    matched = match_symptoms(symptom_list)
+    if not matched:
         return None  # No valid symptom found
 
+    input_vector = np.zeros(len(X_columns), dtype=np.uint8)
+    input_vector[[symptom_index[m] for m in matched]] = 1
+    return input_vector
+
+
+def predict_disease(symptom_list):
+    input_vector = build_input_vector(symptom_list)
+    if input_vector is None:
+        return None
+
     input_df = pd.DataFrame([input_vector], columns=X_columns)
     prediction = model.predict(input_df)[0]
     return le.inverse_transform([prediction])[0]
 
 
+def predict_top_diseases(symptom_list, top_k=3):
+    """
+    Ranked differential diagnosis in a single model call.
+    Returns a list of dicts with disease, probability (None when the model
+    only votes 0/1), matched and profile_size, or None if no symptom was recognised.
+    """
+    input_vector = build_input_vector(symptom_list)
+    if input_vector is None:
+        return None
+
+    input_df = pd.DataFrame([input_vector], columns=X_columns)
+    if hasattr(model, "predict_proba"):
+        probs = model.predict_proba(input_df)[0]
+        classes = model.classes_
+    else:
+        probs = np.ones(1)
+        classes = model.predict(input_df)
+
+    # Matched-symptom counts for every disease at once
+    matched = profile_matrix[classes] @ input_vector.astype(np.int32)
+    coverage = matched / np.maximum(profile_sizes[classes], 1)
+
+    # Diseases that explain at least one reported symptom come first, then by
+    # probability, then by how many symptoms the profile explains. A fully
+    # grown tree gives every class but one probability 0, so the rest of the
+    # top-k is filled from the profile match alone.
+    order = np.lexsort((-coverage, -matched, -probs, matched == 0))
+    order = [i for n, i in enumerate(order) if n == 0 or probs[i] > 0 or matched[i] > 0][:top_k]
+    names = le.inverse_transform(classes[order])
+
+    # 0/1 leaf values are a vote, not a probability worth showing as a percentage
+    calibrated = hasattr(model, "predict_proba") and not np.isin(probs, (0.0, 1.0)).all()
+
+    results = []
+    for name, i in zip(names, order):
+        results.append({
+            "disease": name,
+            "probability": float(probs[i]) if calibrated else None,
+            "matched": int(matched[i]),
+            "profile_size": int(profile_sizes[classes[i]]),
+        })
+    return results
+
+
+@metrics.timed()
 def get_description(disease_name):
     try:
         disease_name_clean = disease_name.strip().lower().replace("👉", "").strip()
@@ -100,6 +158,7 @@ def get_description(disease_name):
     except Exception as e:
         return f"❌ Error reading description: {e}"
 
+@metrics.timed()
 def get_medications(disease_name):
     try:
         result = medications_df[medications_df['Disease'] == disease_name.lower()]
@@ -114,17 +173,19 @@ def get_medications(disease_name):
     except Exception as e:
         return [f"❌ Error fetching medication: {e}"]
 
+@metrics.timed()
 def get_precautions(disease):
     try:
         row = precautions_df[precautions_df['Disease'] == disease.lower()]
         if not row.empty:
-            precautions = row.iloc[0, 1:].dropna().tolist()
+            precautions = row.iloc[0][precaution_cols].dropna().tolist()
             return precautions
         else:
             return ["No precautions found for this disease."]
     except Exception as e:
         return [f"❌ Error fetching precautions: {e}"]
 
+@metrics.timed()
 def get_workouts(disease):
     try:
         rows = workout_df[workout_df['disease'].str.lower() == disease.lower()]
@@ -136,6 +197,7 @@ def get_workouts(disease):
     except Exception as e:
         return [f"Error fetching workouts: {e}"]
 
+@metrics.timed()
 def get_diets(disease):
     try:
         row = diets_df[diets_df['disease'].str.lower() == disease.lower()]
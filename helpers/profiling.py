@@ -0,0 +1,176 @@
+# helpers/profiling.py
+
+import cProfile
+import functools
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+from helpers import metrics
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+# MEDIBOT_PROFILE=<seconds> profiles the first N seconds after startup
+PROFILE_ON_START = os.environ.get("MEDIBOT_PROFILE")
+SAMPLE_INTERVAL = 0.005
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class ProfilingSession:
+    """
+    One profiling window. While active:
+      - calls wrapped with @profiled run under cProfile, aggregated per name
+      - a sampler thread records every thread's stack (tagged with its current
+        metrics stage) for collapsed-stack flamegraphs
+      - tracemalloc tracks allocations between the start and end snapshots
+    """
+
+    def __init__(self, duration, out_dir=None):
+        self.duration = duration
+        self.out_dir = out_dir or os.path.join(PROFILE_DIR, datetime.now().strftime("%Y%m%d_%H%M%S"))
+        self.stats = {}
+        self.samples = Counter()
+        self.active = False
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._snapshot = None
+        self._started_tracemalloc = False
+        self._timer = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self._started_tracemalloc = True
+        self._snapshot = tracemalloc.take_snapshot()
+        metrics.track_thread_stages(True)
+        self.active = True
+        threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True).start()
+        # Daemon so closing the app mid-window doesn't leave the process waiting on it
+        self._timer = threading.Timer(self.duration, stop_profiling, args=(self,))
+        self._timer.daemon = True
+        self._timer.start()
+        print(f"🔬 Profiling for {self.duration:.0f}s -> {self.out_dir}")
+
+    def record(self, name, profile):
+        with self._stats_lock:
+            if name in self.stats:
+                self.stats[name].add(profile)
+            else:
+                self.stats[name] = pstats.Stats(profile)
+
+    def _sample_loop(self):
+        me = threading.get_ident()
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stage = metrics.current_stage(ident) or "-"
+                key = ";".join([names.get(ident, str(ident)), stage] + stack[::-1])
+                self.samples[key] += 1
+
+    def stop(self):
+        self.active = False
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.cancel()
+        metrics.track_thread_stages(False)
+        os.makedirs(self.out_dir, exist_ok=True)
+
+        with self._stats_lock:
+            for name, stats in self.stats.items():
+                stats.dump_stats(os.path.join(self.out_dir, f"{name}.pstats"))
+                with open(os.path.join(self.out_dir, f"{name}.txt"), "w") as f:
+                    stats.stream = f
+                    stats.sort_stats("cumulative").print_stats(40)
+
+        # Collapsed stacks: one file for everything plus one per metrics stage,
+        # ready for flamegraph.pl / speedscope
+        per_stage = {}
+        for key, count in self.samples.items():
+            stage = key.split(";", 2)[1]
+            per_stage.setdefault(stage, []).append((key, count))
+        with open(os.path.join(self.out_dir, "all.collapsed"), "w") as f:
+            for key, count in self.samples.most_common():
+                f.write(f"{key} {count}\n")
+        for stage, rows in per_stage.items():
+            if stage == "-":
+                continue
+            with open(os.path.join(self.out_dir, f"stage_{stage}.collapsed"), "w") as f:
+                for key, count in rows:
+                    f.write(f"{key} {count}\n")
+
+        snapshot = tracemalloc.take_snapshot()
+        snapshot.dump(os.path.join(self.out_dir, "end.tracemalloc"))
+        with open(os.path.join(self.out_dir, "allocations.txt"), "w") as f:
+            current, peak = tracemalloc.get_traced_memory()
+            f.write(f"traced current={current / 1e6:.1f}MB peak={peak / 1e6:.1f}MB\n\n")
+            for stat in snapshot.compare_to(self._snapshot, "lineno")[:50]:
+                f.write(f"{stat}\n")
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        print(f"🔬 Profile written to {self.out_dir}")
+
+
+def start_profiling(duration=30, out_dir=None):
+    """Start a profiling window unless one is already running; returns the session."""
+    global _session
+    with _session_lock:
+        if _session is not None and _session.active:
+            return _session
+        _session = ProfilingSession(float(duration), out_dir)
+        _session.start()
+        return _session
+
+
+def stop_profiling(session=None):
+    """Stop the running window (or only `session`, if given and still running)."""
+    global _session
+    with _session_lock:
+        if session is not None and session is not _session:
+            return session
+        session, _session = _session, None
+    if session is not None and session.active:
+        session.stop()
+    return session
+
+
+def profiled(name=None):
+    """Run the function under cProfile while a profiling window is open; free otherwise."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            session = _session
+            if session is None or not session.active:
+                return func(*args, **kwargs)
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler already owns this thread (nested call)
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                session.record(label, profile)
+        return wrapper
+    return decorator
+
+
+def start_from_env():
+    if PROFILE_ON_START:
+        start_profiling(float(PROFILE_ON_START) if PROFILE_ON_START.replace(".", "", 1).isdigit() else 30)
@@ -0,0 +1,114 @@
+# helpers/query_parser.py
+
+import re
+from collections import namedtuple
+
+ParsedQuery = namedtuple("ParsedQuery", ["info_type", "wants_alternative", "medicine_name"])
+
+# Keyword -> info type (None means "strip from the name, but no field implied")
+INFO_KEYWORDS = {
+    "how to use": "howtouse", "how do i take": "howtouse", "how to take": "howtouse",
+    "usage": "howtouse", "use": "howtouse", "take": "howtouse",
+    "side effect": "sideeffect", "side effects": "sideeffect", "sideeffect": "sideeffect",
+    "sideeffects": "sideeffect", "adverse effect": "sideeffect", "adverse effects": "sideeffect",
+    "adverse": "sideeffect",
+    "benefit": "productbenefits", "benefits": "productbenefits",
+    "safety": "safetyadvice", "safety advice": "safetyadvice", "safe": "safetyadvice",
+    "habit forming": "habit_forming", "habit": "habit_forming", "addictive": "habit_forming",
+    "chemical class": "chemical_class", "chemical": "chemical_class",
+    "therapeutic class": "therapeutic_class", "therapeutic": "therapeutic_class",
+    "action class": "action_class", "action": "action_class",
+    "composition": "contains", "contains": "contains", "ingredients": "contains",
+    "uses": "productuses", "used for": "productuses",
+    "product information": "productintroduction", "product": "productintroduction",
+    "introduction": "productintroduction",
+    "how does it work": None, "class": None, "manufacturer": None, "manufacture": None,
+    "info": None, "information": None, "details": None,
+    "tablet": None, "tablets": None, "capsule": None, "capsules": None, "syrup": None,
+    "medicine": None, "med": None,
+}
+
+ALTERNATIVE_KEYWORDS = {"alternative", "alternatives", "alternate", "substitute", "substitutes"}
+
+STOPWORDS = {
+    "what", "is", "the", "of", "tell", "me", "about", "effects", "are", "side",
+    "please", "give", "for", "to",
+}
+
+# Words that may surround a bare follow-up ("does it have side effects?")
+FOLLOWUP_FILLERS = {
+    "it", "its", "it's", "this", "that", "them", "they", "does", "do", "have", "has",
+    "any", "and", "how", "about", "whats", "what's", "can", "should", "i", "you", "again", "also",
+}
+
+# Disease follow-ups answered from the last prediction
+DISEASE_FIELD_KEYWORDS = {
+    "description": "description", "describe": "description", "explain": "description",
+    "medication": "medications", "medications": "medications", "treatment": "medications",
+    "precaution": "precautions", "precautions": "precautions",
+    "diet": "diets", "diets": "diets", "food": "diets", "eat": "diets",
+    "workout": "workouts", "workouts": "workouts", "exercise": "workouts", "exercises": "workouts",
+}
+_word_re = re.compile(r"[a-z']+")
+
+# When a query names several fields, the earlier entry wins
+INFO_PRIORITY = [
+    "howtouse", "sideeffect", "productbenefits", "safetyadvice", "habit_forming",
+    "chemical_class", "therapeutic_class", "action_class", "contains",
+    "productuses", "productintroduction",
+]
+_rank = {info_type: i for i, info_type in enumerate(INFO_PRIORITY)}
+
+_phrases = sorted(set(INFO_KEYWORDS) | ALTERNATIVE_KEYWORDS | STOPWORDS, key=len, reverse=True)
+_token_re = re.compile(
+    r"\b(" + "|".join(re.escape(p).replace(r"\ ", r"[\s\-]+") for p in _phrases) + r")\b"
+    r"|[^a-z0-9\s]+"
+)
+_gap_re = re.compile(r"[\s\-]+")
+
+
+def parse_query(query):
+    """
+    Split a medicine query into (info_type, wants_alternative, medicine_name)
+    with a single scan of the lower-cased text.
+    """
+    text = query.lower()
+    info_type = None
+    wants_alternative = False
+    residual = []
+    pos = 0
+
+    for m in _token_re.finditer(text):
+        residual.append(text[pos:m.start()])
+        pos = m.end()
+        word = m.group(1)
+        if word is None:
+            continue  # punctuation
+        word = _gap_re.sub(" ", word)
+        if word in ALTERNATIVE_KEYWORDS:
+            wants_alternative = True
+            continue
+        found = INFO_KEYWORDS.get(word)
+        if found and (info_type is None or _rank[found] < _rank[info_type]):
+            info_type = found
+    residual.append(text[pos:])
+
+    medicine_name = " ".join("".join(residual).split())
+    return ParsedQuery(info_type, wants_alternative, medicine_name)
+
+
+def is_followup(parsed):
+    """True if the query asks for a field or alternatives but names no medicine, e.g. "side effects?"."""
+    return (bool(parsed.info_type) or parsed.wants_alternative) and \
+        all(w in FOLLOWUP_FILLERS for w in parsed.medicine_name.split())
+
+
+def parse_disease_followup(query):
+    """Field asked about in a bare disease follow-up ("what about diet?"), else None."""
+    field = None
+    for word in _word_re.findall(query.lower()):
+        if word in DISEASE_FIELD_KEYWORDS:
+            field = field or DISEASE_FIELD_KEYWORDS[word]
+        elif word not in FOLLOWUP_FILLERS and word not in STOPWORDS:
+            return None
+    return field
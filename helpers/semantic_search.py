@@ -0,0 +1,123 @@
+# helpers/semantic_search.py
+
+import json
+import os
+import threading
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.path.join(BASE_DIR, "..", "model", "semantic")  # written by build_semantic_index.py
+VECTORS_FILE = "vectors.npy"
+TERMS_FILE = "terms.npz"
+ENCODER_FILE = "encoder.pkl"
+DOCS_FILE = "docs.json"
+
+# Calibrated with benchmarks/calibrate_semantic.py on benchmarks/semantic_queries.jsonl.
+# LSA alone scores unrelated products highly when they share one folded
+# direction ("acid reflux" -> folic acid), so a hit must also contain enough
+# of the query's own words.
+MIN_SCORE = 0.45  # cosine similarity in LSA space (0.35 before the coverage check)
+MIN_COVERAGE = 0.6  # idf-weighted share of the query's content terms present in the document
+CANDIDATES = 50  # best-cosine documents checked for term coverage
+
+# Words that carry no need on their own ("something for ...", "medicine for ...")
+QUERY_STOP_WORDS = {
+    "medicine", "medicines", "medication", "drug", "drugs", "tablet", "tablets", "syrup", "cream", "good",
+    "help", "helps", "helpful", "best", "need", "want", "suggest", "recommend", "treat", "treatment", "cure",
+    "remedy", "feel", "feeling", "feels", "take", "use", "used", "like", "night", "day", "morning", "today",
+}
+
+_index = None
+_lock = threading.Lock()
+
+
+class SemanticIndex:
+    """
+    LSA vectors memory-mapped from disk; a query is one mat-vec plus
+    argpartition, then a term-coverage check against the best candidates.
+    """
+
+    def __init__(self, directory=INDEX_DIR):
+        import joblib
+        from scipy import sparse
+        self.encoder = joblib.load(os.path.join(directory, ENCODER_FILE))
+        self.vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode="r")
+        self.terms = sparse.load_npz(os.path.join(directory, TERMS_FILE)).tocsr()
+        with open(os.path.join(directory, DOCS_FILE), encoding="utf-8") as f:
+            docs = json.load(f)
+        self.sources = docs["sources"]
+        self.names = docs["names"]
+        self.snippets = docs["snippets"]
+        tfidf = self.encoder[0]
+        self.vocabulary = tfidf.vocabulary_
+        self.idf = tfidf.idf_
+        self.max_idf = float(self.idf.max()) if len(self.idf) else 1.0
+        self._analyze = tfidf.build_analyzer()
+
+    def content_terms(self, text):
+        """Distinct single-word terms of the query worth matching, stop words removed."""
+        return list(dict.fromkeys(t for t in self._analyze(text) if " " not in t and t not in QUERY_STOP_WORDS))
+
+    def embed(self, text):
+        vector = self.encoder.transform([text])[0].astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def coverage(self, terms, doc):
+        """Share of the terms' idf weight found in document `doc`; unknown words weigh the most."""
+        present = set(self.terms.indices[self.terms.indptr[doc]:self.terms.indptr[doc + 1]])
+        total = found = 0.0
+        for term in terms:
+            column = self.vocabulary.get(term)
+            weight = self.max_idf if column is None else float(self.idf[column])
+            total += weight
+            if column is not None and column in present:
+                found += weight
+        return found / total if total else 0.0
+
+    def search(self, text, top_k=5, min_score=MIN_SCORE, min_coverage=MIN_COVERAGE):
+        """[{name, source, score, coverage, snippet}] best first."""
+        terms = self.content_terms(text)
+        if not terms:
+            return []
+        query = self.embed(text)
+        if not query.any():
+            return []
+        scores = self.vectors @ query
+        k = min(max(top_k, CANDIDATES), len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        hits = []
+        for i in top:
+            if scores[i] < min_score:
+                break
+            coverage = self.coverage(terms, i)
+            if coverage >= min_coverage:
+                hits.append({"name": self.names[i], "source": self.sources[i], "score": float(scores[i]),
+                             "coverage": coverage, "snippet": self.snippets[i]})
+                if len(hits) == top_k:
+                    break
+        return hits
+
+
+def get_index():
+    """The index, loaded on first use; None if it hasn't been built."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                if not os.path.exists(os.path.join(INDEX_DIR, TERMS_FILE)):
+                    _index = False  # missing, or built before term coverage existed
+                else:
+                    try:
+                        _index = SemanticIndex()
+                    except Exception as e:
+                        print("⚠️ Error loading semantic index:", e)
+                        _index = False
+    return _index or None
+
+
+def search(text, top_k=5, min_score=MIN_SCORE, min_coverage=MIN_COVERAGE):
+    index = get_index()
+    return index.search(text, top_k, min_score, min_coverage) if index else []
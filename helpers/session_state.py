@@ -0,0 +1,64 @@
+# helpers/session_state.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+SESSION_TTL = float(os.environ.get("MEDIBOT_SESSION_TTL", "900"))  # seconds of inactivity
+MAX_SESSIONS = int(os.environ.get("MEDIBOT_MAX_SESSIONS", "1000"))
+
+
+class SessionState:
+    """The entity a user's last answer was about: a medicine (with its MID row) or a disease."""
+
+    __slots__ = ("kind", "name", "record", "expires")
+
+    def __init__(self, kind, name, record, expires):
+        self.kind = kind
+        self.name = name
+        self.record = record
+        self.expires = expires
+
+
+class SessionStore:
+    """
+    Per-user conversation context, dropped after `ttl` seconds without use
+    and capped at `max_sessions` users (least recently active evicted first).
+    """
+
+    def __init__(self, ttl=SESSION_TTL, max_sessions=MAX_SESSIONS):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is None:
+                return None
+            now = time.monotonic()
+            if state.expires < now:
+                del self._states[user_id]
+                return None
+            state.expires = now + self.ttl
+            self._states.move_to_end(user_id)
+            return state
+
+    def remember(self, user_id, kind, name, record=None):
+        with self._lock:
+            self._states[user_id] = SessionState(kind, name, record, time.monotonic() + self.ttl)
+            self._states.move_to_end(user_id)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+
+    def forget(self, user_id):
+        with self._lock:
+            self._states.pop(user_id, None)
+
+    def __len__(self):
+        return len(self._states)
+
+
+sessions = SessionStore()
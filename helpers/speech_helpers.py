@@ -0,0 +1,302 @@
+# helpers/speech_helpers.py
+
+import os
+import queue
+import threading
+
+import numpy as np
+
+from helpers import profiling
+
+try:
+    import whisper
+except ImportError:
+    whisper = None
+
+try:
+    from faster_whisper import WhisperModel  # optional CTranslate2 backend (int8 on CPU)
+except ImportError:
+    WhisperModel = None
+
+SAMPLE_RATE = 16000  # Whisper's native rate; buffers at this rate skip resampling
+
+# Overridable from the environment, e.g. MEDIBOT_WHISPER_MODEL=tiny.en
+DEFAULT_MODEL = os.environ.get("MEDIBOT_WHISPER_MODEL", "base.en")
+DEFAULT_BACKEND = os.environ.get("MEDIBOT_STT_BACKEND", "whisper")  # "whisper" or "faster-whisper"
+DEFAULT_COMPUTE_TYPE = os.environ.get("MEDIBOT_STT_COMPUTE_TYPE", "int8")
+
+FRAME_MS = 30  # VAD frame / capture block size
+
+
+def prepare_audio(audio, samplerate=SAMPLE_RATE):
+    """
+    Turn a recording buffer into what Whisper consumes directly: 1-D float32 PCM
+    at 16 kHz. No temp file, no ffmpeg process.
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)  # (frames, channels) -> mono
+    if samplerate != SAMPLE_RATE:
+        duration = len(audio) / samplerate
+        target = np.linspace(0, duration, int(duration * SAMPLE_RATE), endpoint=False)
+        source = np.arange(len(audio)) / samplerate
+        audio = np.interp(target, source, audio).astype(np.float32)
+    return np.ascontiguousarray(audio)
+
+
+def load_wav(path):
+    """Read a WAV fixture into the same in-memory format the microphone path produces."""
+    import soundfile as sf
+    audio, samplerate = sf.read(path, dtype="float32")
+    return prepare_audio(audio, samplerate)
+
+
+class TranscriptionService:
+    """
+    Owns the speech model and one persistent worker thread. The model is loaded
+    (and warmed up) on that worker, and transcription jobs queue behind the load,
+    so callers never block on it and never load it twice.
+    """
+
+    def __init__(self, model_size=DEFAULT_MODEL, backend=DEFAULT_BACKEND, compute_type=DEFAULT_COMPUTE_TYPE):
+        self.model_size = model_size
+        self.backend = backend
+        self.compute_type = compute_type
+        self.model = None
+        self.load_error = None
+        self.ready = threading.Event()
+        self._jobs = queue.Queue()
+        self._load_requested = False
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="stt-worker", daemon=True)
+        self._worker.start()
+
+    @property
+    def available(self):
+        if self.backend == "faster-whisper":
+            return WhisperModel is not None
+        return whisper is not None
+
+    def preload(self, on_ready=None):
+        """Start loading the model in the background; safe to call repeatedly."""
+        with self._lock:
+            if not self._load_requested:
+                self._load_requested = True
+                self._jobs.put(("load", None, None))
+        if on_ready:
+            self._jobs.put(("notify", None, on_ready))
+
+    def transcribe(self, audio, on_result):
+        """
+        Queue audio for transcription: preferably a float32 mono array at 16 kHz
+        (see prepare_audio); a file path also works but goes through ffmpeg.
+        on_result(text, error) is called from the worker thread.
+        """
+        self.preload()
+        self._jobs.put(("transcribe", audio, on_result))
+
+    def shutdown(self):
+        self._jobs.put(("stop", None, None))
+
+    def _run(self):
+        while True:
+            kind, audio, callback = self._jobs.get()
+            if kind == "stop":
+                break
+            if kind == "load":
+                self._load_model()
+            elif kind == "notify":
+                callback(self.load_error)
+            elif kind == "transcribe":
+                if self.model is None:
+                    callback("", self.load_error or RuntimeError("Speech model is not loaded"))
+                    continue
+                try:
+                    callback(self._transcribe(audio), None)
+                except Exception as e:
+                    callback("", e)
+
+    def _load_model(self):
+        print(f"Loading speech model '{self.model_size}' ({self.backend})...")
+        try:
+            if self.backend == "faster-whisper":
+                if WhisperModel is None:
+                    raise ImportError("faster-whisper is not installed")
+                self.model = WhisperModel(self.model_size, device="cpu", compute_type=self.compute_type)
+            else:
+                if whisper is None:
+                    raise ImportError("openai-whisper is not installed")
+                self.model = whisper.load_model(self.model_size)
+            # The first inference pays for lazy initialisation; do it now
+            self._transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+            print("Speech model loaded and warmed up.")
+        except Exception as e:
+            print(f"Could not load speech model: {e}")
+            self.model = None
+            self.load_error = e
+        finally:
+            self.ready.set()
+
+    @profiling.profiled("stt_transcribe")
+    def _transcribe(self, audio):
+        if self.backend == "faster-whisper":
+            segments, _ = self.model.transcribe(audio, language="en")
+            return " ".join(s.text.strip() for s in segments)
+        return self.model.transcribe(audio, fp16=False)["text"]
+
+
+class EnergyVAD:
+    """
+    Frame-level voice activity detector based on RMS energy against an adaptive
+    noise floor. Cheap enough to run inside the audio callback path.
+    """
+
+    def __init__(self, frame_ms=FRAME_MS, ratio=3.0, min_rms=0.005, noise_alpha=0.05):
+        self.frame_len = int(SAMPLE_RATE * frame_ms / 1000)
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.noise_alpha = noise_alpha
+        self.noise_floor = None
+
+    def is_speech(self, frame):
+        rms = float(np.sqrt(np.mean(np.square(frame)))) if len(frame) else 0.0
+        if self.noise_floor is None:
+            self.noise_floor = rms
+        speech = rms > max(self.min_rms, self.noise_floor * self.ratio)
+        if not speech:
+            # Track background noise only while nobody is talking
+            self.noise_floor += self.noise_alpha * (rms - self.noise_floor)
+        return speech
+
+
+class VoiceCapture:
+    """
+    Consumes audio chunks (from the microphone or a WAV fixture), stops at
+    end-of-speech, and streams partial transcriptions while the user talks.
+
+    on_partial(text) and on_final(text, error) are called from the
+    transcription worker thread; on_speech_end() from the feeding thread.
+    """
+
+    def __init__(self, service, on_final, on_partial=None, on_speech_end=None, vad=None, end_silence_ms=700,
+                 no_speech_timeout_ms=5000, max_seconds=15, partial_interval_ms=1500, preroll_ms=300):
+        self.service = service
+        self.on_final = on_final
+        self.on_partial = on_partial
+        self.on_speech_end = on_speech_end
+        self.vad = vad or EnergyVAD()
+        self.frame_len = self.vad.frame_len
+        frame_ms = 1000 * self.frame_len / SAMPLE_RATE
+        self.end_silence_frames = int(end_silence_ms / frame_ms)
+        self.no_speech_frames = int(no_speech_timeout_ms / frame_ms)
+        self.max_frames = int(max_seconds * 1000 / frame_ms)
+        self.partial_frames = int(partial_interval_ms / frame_ms)
+        self.preroll_frames = int(preroll_ms / frame_ms)
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._frames = []
+        self._frame_count = 0
+        self._speech_started = False
+        self._silence_run = 0
+        self._last_partial_at = 0
+        self._partial_in_flight = False
+        self.done = False
+
+    def feed(self, chunk):
+        """Add a chunk of float32 samples; returns True once the utterance has ended."""
+        if self.done:
+            return True
+        self._pending = np.concatenate([self._pending, prepare_audio(chunk)])
+        while len(self._pending) >= self.frame_len and not self.done:
+            frame, self._pending = self._pending[:self.frame_len], self._pending[self.frame_len:]
+            self._process_frame(frame)
+        return self.done
+
+    def finish(self):
+        """Force the end of the utterance (e.g. the source ran out)."""
+        if not self.done:
+            self._end()
+
+    def _process_frame(self, frame):
+        self._frame_count += 1
+        speech = self.vad.is_speech(frame)
+        self._frames.append(frame)
+
+        if not self._speech_started:
+            if speech:
+                self._speech_started = True
+                self._last_partial_at = len(self._frames)
+            else:
+                # Keep a short pre-roll so the first syllable isn't clipped
+                del self._frames[:-self.preroll_frames or None]
+                if self._frame_count >= self.no_speech_frames:
+                    self._end()
+            return
+
+        self._silence_run = 0 if speech else self._silence_run + 1
+        if self._silence_run >= self.end_silence_frames or self._frame_count >= self.max_frames:
+            self._end()
+        elif len(self._frames) - self._last_partial_at >= self.partial_frames:
+            self._send_partial()
+
+    def _send_partial(self):
+        self._last_partial_at = len(self._frames)
+        if self.on_partial is None or self._partial_in_flight or not self.service.ready.is_set():
+            return  # don't pile work up behind a slow model
+        self._partial_in_flight = True
+
+        def on_result(text, error):
+            self._partial_in_flight = False
+            if not error and text.strip() and not self.done:
+                self.on_partial(text.strip())
+
+        self.service.transcribe(np.concatenate(self._frames), on_result)
+
+    def _end(self):
+        self.done = True
+        if self.on_speech_end:
+            self.on_speech_end()
+        if not self._speech_started:
+            self.on_final("", None)
+            return
+        # Drop the trailing silence before the final pass
+        frames = self._frames[:len(self._frames) - self._silence_run] or self._frames
+        self.service.transcribe(np.concatenate(frames), self.on_final)
+
+
+def microphone_chunks(block_ms=FRAME_MS):
+    """Yield float32 blocks from the default input device; closing the generator stops the stream."""
+    import sounddevice as sd
+    blocks = queue.Queue()
+
+    def callback(indata, frames, time_info, status):
+        blocks.put(indata[:, 0].copy())
+
+    with sd.InputStream(samplerate=SAMPLE_RATE, channels=1, dtype="float32",
+                        blocksize=int(SAMPLE_RATE * block_ms / 1000), callback=callback):
+        while True:
+            try:
+                yield blocks.get(timeout=1.0)
+            except queue.Empty:
+                return  # device stopped delivering audio
+
+
+def wav_chunks(path, block_ms=FRAME_MS):
+    """Yield a WAV fixture in microphone-sized blocks, for offline testing."""
+    audio = load_wav(path)
+    step = int(SAMPLE_RATE * block_ms / 1000)
+    for start in range(0, len(audio), step):
+        yield audio[start:start + step]
+
+
+def run_capture(capture, chunks):
+    """Drive a VoiceCapture from any chunk source until end-of-speech."""
+    try:
+        for chunk in chunks:
+            if capture.feed(chunk):
+                break
+        capture.finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
@@ -0,0 +1,94 @@
+# helpers/symptom_index.py
+
+import csv
+import os
+
+# Inverted index over data/symtoms_df.csv: each symptom maps to an int bitset
+# with one bit per disease, so candidate narrowing is just & and bit_count().
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+csv_path = os.path.join(BASE_DIR, "..", "data", "symtoms_df.csv")
+
+diseases = []
+symptom_bits = {}
+
+
+def _load_index(path):
+    disease_ids = {}
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                disease = row["Disease"].strip()
+                if disease not in disease_ids:
+                    disease_ids[disease] = len(diseases)
+                    diseases.append(disease)
+                bit = 1 << disease_ids[disease]
+                for key, value in row.items():
+                    if key.startswith("Symptom") and value and value.strip():
+                        sym = value.strip().lower()
+                        symptom_bits[sym] = symptom_bits.get(sym, 0) | bit
+    except Exception as e:
+        print("⚠️ Error loading symptom index:", e)
+
+
+_load_index(csv_path)
+all_diseases = (1 << len(diseases)) - 1
+
+
+def candidate_bits(symptoms):
+    """
+    Bitset of diseases consistent with all given symptoms. If no disease has
+    every symptom, falls back to the diseases explaining the most of them.
+    """
+    bits = [symptom_bits[s] for s in symptoms if s in symptom_bits]
+    if not bits:
+        return 0
+
+    candidates = all_diseases
+    for b in bits:
+        candidates &= b
+    if candidates:
+        return candidates
+
+    # Count matches per disease and keep the best-scoring ones
+    counts = {}
+    for b in bits:
+        while b:
+            low = b & -b
+            counts[low] = counts.get(low, 0) + 1
+            b ^= low
+    best = max(counts.values())
+    for low, count in counts.items():
+        if count == best:
+            candidates |= low
+    return candidates
+
+
+def bits_to_diseases(bits):
+    return [name for i, name in enumerate(diseases) if bits >> i & 1]
+
+
+def candidate_diseases(symptoms):
+    return bits_to_diseases(candidate_bits(symptoms))
+
+
+def suggest_followups(symptoms, limit=3):
+    """
+    Symptoms that best split the remaining candidate diseases in half,
+    i.e. the questions whose answer narrows the diagnosis the most.
+    """
+    candidates = candidate_bits(symptoms)
+    total = candidates.bit_count()
+    if total < 2:
+        return []
+
+    given = set(symptoms)
+    scored = []
+    for sym, bits in symptom_bits.items():
+        if sym in given:
+            continue
+        hits = (bits & candidates).bit_count()
+        if 0 < hits < total:
+            scored.append((abs(2 * hits - total), sym))
+
+    scored.sort()
+    return [sym for _, sym in scored[:limit]]
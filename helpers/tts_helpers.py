@@ -0,0 +1,287 @@
+# helpers/tts_helpers.py
+
+import hashlib
+import os
+import queue
+import re
+import sys
+import threading
+import time
+
+from helpers import profiling
+
+try:
+    import pyttsx3
+except ImportError:
+    pyttsx3 = None
+
+try:
+    import sounddevice as sd
+    import soundfile as sf
+    PLAYBACK_ENABLED = True
+except ImportError:
+    PLAYBACK_ENABLED = False
+
+RATE = 150
+VOLUME = 0.9
+MAX_CHUNK_CHARS = 200
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "..", "cache", "tts")
+CACHE_BUDGET_BYTES = int(float(os.environ.get("MEDIBOT_TTS_CACHE_MB", "50")) * 1024 * 1024)
+
+_sentence_re = re.compile(r"(?<=[.!?])\s+|\n+")
+_markup_re = re.compile(r"\*\*|__|`")
+
+
+def default_driver():
+    """pyttsx3 driver for this platform; MEDIBOT_TTS_DRIVER overrides (use "null" for tests)."""
+    override = os.environ.get("MEDIBOT_TTS_DRIVER")
+    if override:
+        return override
+    if sys.platform.startswith("win"):
+        return "sapi5"
+    if sys.platform == "darwin":
+        return "nsss"
+    return "espeak"
+
+
+def split_chunks(text, max_chars=MAX_CHUNK_CHARS):
+    """
+    Split a response into sentence-sized pieces so speech can start after the
+    first one is synthesised, and so it can be cancelled between pieces.
+    """
+    text = _markup_re.sub("", text)
+    chunks = []
+    for sentence in _sentence_re.split(text):
+        sentence = sentence.strip(" -•\t")
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(",", 0, max_chars)
+            if cut <= 0:
+                cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars - 1  # no break point: hard cut, still within max_chars
+            chunks.append(sentence[:cut + 1].strip())
+            sentence = sentence[cut + 1:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+
+class NullEngine:
+    """Stand-in engine that records what would have been spoken."""
+
+    def __init__(self):
+        self.spoken = []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, text):
+        self.spoken.append(text)
+
+    def runAndWait(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class AudioCache:
+    """
+    Synthesised WAV files keyed by a hash of (voice settings, text), evicted
+    least-recently-used first once the directory exceeds its byte budget.
+    Only touched from the TTS worker thread.
+    """
+
+    def __init__(self, directory=CACHE_DIR, budget_bytes=CACHE_BUDGET_BYTES, voice_key=""):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.voice_key = voice_key
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        # path -> (size, last used); file mtimes persist recency across runs
+        self._entries = {}
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith(".wav"):
+                st = entry.stat()
+                self._entries[entry.path] = (st.st_size, st.st_mtime)
+        self._total = sum(size for size, _ in self._entries.values())
+
+    def path_for(self, text):
+        digest = hashlib.sha256(f"{self.voice_key}\0{text}".encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, digest + ".wav")
+
+    def get(self, text):
+        path = self.path_for(text)
+        entry = self._entries.get(path)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        now = time.time()
+        self._entries[path] = (entry[0], now)
+        os.utime(path, (now, now))
+        return path
+
+    def store(self, text, synthesize):
+        """Render text with synthesize(text, path) into the cache; returns the path or None."""
+        path = self.path_for(text)
+        tmp_path = path + ".tmp.wav"
+        try:
+            synthesize(text, tmp_path)
+            size = os.path.getsize(tmp_path)
+            if size == 0:
+                raise OSError("synthesiser produced an empty file")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"TTS cache: could not render audio: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        old = self._entries.get(path)
+        self._total += size - (old[0] if old else 0)
+        self._entries[path] = (size, time.time())
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep=None):
+        if self._total <= self.budget_bytes:
+            return
+        for path, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if self._total <= self.budget_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            del self._entries[path]
+            self._total -= size
+
+
+class TTSWorker:
+    """
+    Single thread that owns the TTS engine and speaks queued responses chunk by
+    chunk. stop() cancels the current response at the next chunk boundary and
+    drops anything queued. With use_cache, chunks are played back from the
+    audio cache and rendered into it on a miss.
+    """
+
+    def __init__(self, driver=None, rate=RATE, volume=VOLUME, use_cache=True):
+        self.driver = driver or default_driver()
+        self.rate = rate
+        self.volume = volume
+        self.use_cache = use_cache and PLAYBACK_ENABLED and self.driver != "null"
+        self.engine = None
+        self.cache = None
+        self.ready = threading.Event()
+        self._jobs = queue.Queue()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self._worker.start()
+
+    @property
+    def enabled(self):
+        self.ready.wait()
+        return self.engine is not None
+
+    def speak(self, text, on_finish=None):
+        """Queue text to be spoken; returns immediately. on_finish runs on the worker thread."""
+        with self._lock:
+            generation = self._generation
+        self._jobs.put((generation, text, on_finish))
+
+    def prerender(self, texts):
+        """Render fixed responses into the audio cache in the background."""
+        self._jobs.put((None, list(texts), None))
+
+    def stop(self):
+        with self._lock:
+            self._generation += 1
+        try:
+            if self.cache is not None:
+                sd.stop()
+            if self.engine is not None:
+                self.engine.stop()
+        except Exception as e:
+            print(f"Text-to-speech stop error: {e}")
+
+    def shutdown(self):
+        self.stop()
+        self._jobs.put(None)
+
+    def _cancelled(self, generation):
+        return generation != self._generation
+
+    def _init_engine(self):
+        try:
+            if self.driver == "null":
+                self.engine = NullEngine()
+            else:
+                self.engine = pyttsx3.init(driverName=self.driver)
+            self.engine.setProperty("rate", self.rate)
+            self.engine.setProperty("volume", self.volume)
+        except Exception as e:
+            print(f"Error initializing TTS engine ({self.driver}): {e}. TTS will be disabled.")
+            self.engine = None
+        else:
+            if self.use_cache:
+                try:
+                    voice = self.engine.getProperty("voice")
+                    self.cache = AudioCache(voice_key=f"{self.driver}|{voice}|{self.rate}|{self.volume}")
+                except Exception as e:
+                    print(f"TTS audio cache disabled: {e}")
+        finally:
+            self.ready.set()
+
+    def _synthesize(self, text, path):
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+
+    @profiling.profiled("tts_speak")
+    def _speak_chunk(self, chunk):
+        if self.cache is not None:
+            path = self.cache.get(chunk) or self.cache.store(chunk, self._synthesize)
+            if path:
+                data, samplerate = sf.read(path, dtype="float32")
+                sd.play(data, samplerate)
+                sd.wait()
+                return
+        self.engine.say(chunk)
+        self.engine.runAndWait()
+
+    def _run(self):
+        # The engine must be created on the thread that drives it (COM on Windows)
+        self._init_engine()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            generation, text, on_finish = job
+            if generation is None:
+                self._prerender(text)
+                continue
+            try:
+                if self.engine is not None:
+                    for chunk in split_chunks(text):
+                        if self._cancelled(generation):
+                            break
+                        self._speak_chunk(chunk)
+            except Exception as e:
+                print(f"Text-to-speech error: {e}")
+            finally:
+                if on_finish:
+                    on_finish()
+
+    def _prerender(self, texts):
+        if self.cache is None:
+            return
+        for text in texts:
+            for chunk in split_chunks(text):
+                if self.cache.get(chunk) is None:
+                    self.cache.store(chunk, self._synthesize)
@@ -0,0 +1,71 @@
+"""
+ChatHistory retention: archive old messages to gzipped JSONL segments, return
+freed pages to the OS, and stream a user's full history (archived + live).
+
+Limits come from MEDIBOT_HISTORY_MAX_MESSAGES (per user) and
+MEDIBOT_HISTORY_MAX_AGE_DAYS, or the flags below; 0 (the default) disables a
+limit, so nothing is archived until one is set. The app runs the same maintenance in the background at most once per
+MEDIBOT_MAINTENANCE_INTERVAL_HOURS; this script always runs it.
+
+Usage:
+  python history_maintenance.py run --max-messages 500 --max-age-days 90
+  python history_maintenance.py enable-incremental-vacuum   # once; rewrites the file
+  python history_maintenance.py export --user-id 3 > history.jsonl
+"""
+import argparse
+import sys
+import time
+
+from helpers import history_retention as hr
+from helpers.db_helpers import DB_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--archive-dir", default=hr.ARCHIVE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Archive expired messages and run an incremental vacuum")
+    run.add_argument("--max-messages", type=int, default=hr.MAX_MESSAGES_PER_USER, help="Newest messages kept per user")
+    run.add_argument("--max-age-days", type=int, default=hr.MAX_AGE_DAYS)
+    run.add_argument("--vacuum-pages", type=int, default=hr.VACUUM_PAGES)
+
+    commands.add_parser("enable-incremental-vacuum", help="Convert the file to auto_vacuum=INCREMENTAL")
+
+    export = commands.add_parser("export", help="Stream one user's history as JSONL")
+    export.add_argument("--user-id", type=int, required=True)
+    export.add_argument("--live-only", action="store_true", help="Skip archived segments")
+    export.add_argument("--output", "-o", default="-", help="File, or - for stdout")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "run":
+        summary = hr.run_maintenance(args.db, force=True, max_messages=args.max_messages, max_age_days=args.max_age_days,
+                                     archive_dir=args.archive_dir, vacuum_pages=args.vacuum_pages)
+        print(f"✅ {summary['archived']} messages archived" + (f" to {summary['segment']}" if summary["segment"] else ""))
+        if summary["incremental_vacuum"]:
+            print(f"🧹 Incremental vacuum done, {summary['free_pages']} free pages left")
+        else:
+            print(f"⚠️ auto_vacuum is off ({summary['free_pages']} free pages); run enable-incremental-vacuum once")
+    elif args.command == "enable-incremental-vacuum":
+        conn = hr._connect(args.db)
+        try:
+            converted = hr.enable_incremental_vacuum(conn)
+        finally:
+            conn.close()
+        print("✅ Converted to incremental auto-vacuum" if converted else "✅ Already using incremental auto-vacuum")
+    else:
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            count = hr.export_history(args.user_id, out, args.db, include_archived=not args.live_only,
+                                      archive_dir=args.archive_dir)
+        finally:
+            if args.output != "-":
+                out.close()
+        print(f"✅ {count} messages exported", file=sys.stderr)
+    print(f"⏱️ {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
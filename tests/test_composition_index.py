@@ -0,0 +1,36 @@
+import pytest
+
+from helpers import composition_index as ci
+
+
+def test_parse_composition():
+    assert ci.parse_composition("Amoxycillin (500mg) + Clavulanic Acid (125mg)") == [
+        ("amoxycillin", "500mg"), ("clavulanic acid", "125mg")]
+
+
+def test_key_ignores_order_spacing_and_unit_spelling():
+    assert ci.composition_key("Clavulanic Acid (125 mg) + Amoxycillin (500.0mg)") == \
+        ci.composition_key("Amoxycillin (500mg) + Clavulanic Acid (125mg)")
+    assert ci.composition_key("Paracetamol (1 gm)") == ci.composition_key("Paracetamol (1g)")
+
+
+@pytest.mark.parametrize("contains", [
+    "Pantoprazole (40mg) + Domperidone (30mg) (SR)",
+    "Pantoprazole (40mg) (EC)",
+    "Domperidone (30mg) + Pantoprazole (40mg",
+    "Pantoprazole (40mg) + ",
+    "Pantoprazole (40mg) + (30mg)",
+    None,
+])
+def test_unparseable_compositions_have_no_key(contains):
+    assert ci.parse_composition(contains) == []
+    assert ci.composition_key(contains) == ""
+
+
+def test_substitutes_skip_partially_parsed_combinations():
+    index = ci.CompositionIndex(
+        ["pan 40", "pantocid 40", "pan d"],
+        ["Pantoprazole (40mg)", "Pantoprazole (40 mg)", "Pantoprazole (40mg) + Domperidone (30mg) (SR)"],
+    )
+    assert index.substitutes("pan 40") == ["pantocid 40"]
+    assert index.substitutes("pan d") == []
@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+
+from helpers import example_medicine_helper as emh
+from helpers import medicine_store as ms
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    path = tmp_path / "medicine store #1?.db"  # characters a raw file: URI would misread
+    conn = sqlite3.connect(path)
+    ms.ensure_schema(conn)
+    conn.execute("INSERT INTO MedicineInfo (medicine_id, medicine_name) VALUES (1, 'dolo 650 tablet 15''s')")
+    conn.execute("INSERT INTO AlternativeMedicine (medicine_id, alternative_name, rank, score, price, description, reason) "
+                 "VALUES (1, 'Calpol 650', 1, 80, 30.5, 'Paracetamol', 'Fever')")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(ms, "STORE_PATH", str(path))
+    monkeypatch.setattr(ms, "_local", type(ms._local)())
+    return path
+
+
+def test_connection_opens_paths_with_uri_characters_read_only(store):
+    assert ms.load_names() == ["dolo 650 tablet 15's"]
+    with pytest.raises(sqlite3.OperationalError):
+        ms._connection().execute("DELETE FROM MedicineInfo")
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "pandas"])
+def test_both_backends_key_alternatives_on_the_catalogue_name(backend, store, monkeypatch):
+    seen = []
+    monkeypatch.setattr(ms, "BACKEND", backend)
+    monkeypatch.setattr(ms, "alternatives", lambda name, top_n: seen.append(name) or [])
+    monkeypatch.setattr(emh, "rank_alternatives", lambda name, records, top_n: seen.append(name) or [])
+    emh.find_alternative_medicines("Dolo 650 ", catalogue_name="dolo 650 tablet 15's")
+    emh.find_alternative_medicines("Dolo 650 ")
+    assert seen == ["dolo 650 tablet 15's", "dolo 650"]
+
+
+def test_sqlite_alternatives_are_match_dicts(store):
+    assert ms.alternatives("dolo 650 tablet 15's") == [
+        {"name": "Calpol 650", "score": 80, "price": 30.5, "desc": "Paracetamol", "reason": "Fever"}]
@@ -0,0 +1,64 @@
+import csv
+import os
+
+import pytest
+
+from helpers import name_index as ni
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+CATALOGUE = [
+    "dolo 650 tablet 15's",
+    "azithromycin 500mg tablet 3's",
+    "crocin advance tablet",
+    "hilo capsule 30's",
+    "ferri d 100mg injection",
+    "keto gold soap",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return ni.NameIndex(CATALOGUE)
+
+
+@pytest.fixture(scope="module")
+def medicine_csv_index():
+    with open(os.path.join(DATA_DIR, "medicine.csv"), encoding="utf-8") as f:
+        return ni.NameIndex(row["Drug_Name"].lower() for row in csv.DictReader(f))
+
+
+def test_normalize_spoken_numbers():
+    assert ni.normalize_spoken_numbers("dolo six fifty") == "dolo 650"
+    assert ni.normalize_spoken_numbers("one twenty five") == "125"
+    assert ni.normalize_spoken_numbers("two hundred and fifty mg") == "250 mg"
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("dolo 650", "dolo 650 tablet 15's"),
+    ("dollo six fifty", "dolo 650 tablet 15's"),
+    ("azithro mycin", "azithromycin 500mg tablet 3's"),
+    ("azithromycin five hundred", "azithromycin 500mg tablet 3's"),
+    ("crocin", "crocin advance tablet"),
+])
+def test_lookup_resolves_spoken_and_misspelled_names(index, query, expected):
+    assert index.lookup(query) == expected
+
+
+@pytest.mark.parametrize("query", ["fever", "good cough", "i have pain", "hello", "xyz", "dolo"])
+def test_lookup_rejects_non_medicine_text(index, query):
+    assert index.lookup(query) is None
+
+
+@pytest.mark.parametrize("query", ["fever", "good cough", "i have pain", "hello", "xyz"])
+def test_lookup_rejects_non_medicine_text_over_full_catalogue(medicine_csv_index, query):
+    assert medicine_csv_index.lookup(query) is None
+
+
+def test_short_keys_skip_phonetic_layers(index):
+    assert ni.name_keys("hello")[0] == "HL"
+    assert index.candidates("hello") == []
+
+
+def test_similarity_ignores_trailing_pack_terms(index):
+    assert index.similarity("crocin", "crocin advance tablet") == 1.0
@@ -0,0 +1,76 @@
+import sqlite3
+
+import pytest
+
+from helpers import db_helpers as db
+
+ROLLUP_TABLES = ("PredictionSymptom", "DailyDiseaseCount", "DailySymptomCount", "UserSymptomCount")
+
+# (user_id, symptoms as typed, canonical model symptoms, disease)
+ROWS = [
+    (1, ["Head ache", "fever"], ["headache", "high_fever"], "Migraine"),
+    (1, ["headache ", "vomitting"], ["headache", "vomiting"], "Migraine"),
+    (2, ["high fever", "chills"], ["high_fever", "chills"], "Malaria"),
+    (None, ["itching"], ["itching"], "Fungal infection"),
+]
+CANONICAL = {tuple(db.normalize_symptoms(typed)): canonical for _, typed, canonical, _ in ROWS}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "analytics.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE Prediction (id INTEGER PRIMARY KEY, user_id INTEGER, symptoms TEXT, "
+                     "predicted_disease TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+    return path
+
+
+def insert_all(db_path):
+    for user_id, typed, canonical, disease in ROWS:
+        db.insert_prediction(user_id, typed, disease, db_path=db_path, matched_symptoms=canonical)
+
+
+def snapshot(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {table: sorted(conn.execute(f"SELECT * FROM {table}").fetchall(), key=repr) for table in ROLLUP_TABLES}
+
+
+def test_one_insert_updates_all_four_tables(db_path):
+    db.insert_prediction(7, ["Head ache", "fever"], "Migraine", db_path=db_path,
+                         matched_symptoms=["headache", "high_fever"])
+    tables = snapshot(db_path)
+    assert [(pid, uid, s) for pid, uid, s, _ in tables["PredictionSymptom"]] == [
+        (1, 7, "headache"), (1, 7, "high_fever")]
+    assert [(d, n) for _, d, n in tables["DailyDiseaseCount"]] == [("Migraine", 1)]
+    assert [(s, n) for _, s, n in tables["DailySymptomCount"]] == [("headache", 1), ("high_fever", 1)]
+    assert tables["UserSymptomCount"] == [(7, "headache", 1), (7, "high_fever", 1)]
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT symptoms FROM Prediction").fetchall() == [("Head ache, fever",)]
+
+
+def test_spelling_variants_count_as_one_canonical_symptom(db_path):
+    insert_all(db_path)
+    assert db.top_symptoms(db_path=db_path)[:2] == [("headache", 2), ("high_fever", 2)]
+    assert db.top_symptoms_for_user(1, db_path=db_path)[0] == ("headache", 2)
+    assert db.top_diseases(db_path=db_path)[0] == ("Migraine", 2)
+
+
+def test_backfill_matches_incremental_inserts(db_path):
+    insert_all(db_path)
+    incremental = snapshot(db_path)
+    processed = db.backfill_analytics(db_path, batch_size=3, canonicalize=lambda s: CANONICAL[tuple(s)])
+    assert processed == len(ROWS)
+    assert snapshot(db_path) == incremental
+
+
+def test_top_lists_respect_the_day_window(db_path):
+    insert_all(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE Prediction SET timestamp = datetime('now', '-10 days') WHERE predicted_disease = 'Malaria'")
+    db.backfill_analytics(db_path, canonicalize=lambda s: CANONICAL[tuple(s)])
+
+    assert "Malaria" not in dict(db.top_diseases(days=7, db_path=db_path))
+    assert dict(db.top_diseases(days=30, db_path=db_path))["Malaria"] == 1
+    assert "chills" not in dict(db.top_symptoms(days=7, db_path=db_path))
+    assert dict(db.top_symptoms(days=30, db_path=db_path))["high_fever"] == 2
+    assert dict(db.top_symptoms(days=1, db_path=db_path))["high_fever"] == 1
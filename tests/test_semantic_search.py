@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("scipy")
+
+import build_semantic_index as bsi
+from helpers import semantic_search as sem
+
+QUERIES = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "semantic_queries.jsonl")
+
+DOCS = [
+    ("prices", "Acne Gel", "Acne treat acne vulgaris and pimples on the face"),
+    ("prices", "Acne Soap", "Acne gives smooth, soft, supple and fresh feeling to the skin"),
+    ("prices", "Iron FA", "Anaemia prevent iron and folic acid deficiency"),
+    ("prices", "Gout Tab", "Gout lowers uric acid in patients with gout"),
+    ("prices", "BP Tab", "Hypertension lower high blood pressure"),
+    ("prices", "BP Plus", "Hypertension treat high blood pressure and prevent stroke"),
+    ("prices", "Depra", "Depression used to treat depression and low mood"),
+    ("prices", "Calm", "Anxiety control anxiety and panic"),
+    ("prices", "Fungo", "Fungal treat fungal infection of the skin"),
+    ("prices", "Laxo", "Constipation treat constipation"),
+]
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    out = str(tmp_path_factory.mktemp("semantic"))
+    bsi.build_index(DOCS, out, dims=8, min_df=1)
+    return sem.SemanticIndex(out)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("medicine for acne", "Acne Gel"),
+    ("tablet for high blood pressure", "BP Tab"),
+    ("something for constipation", "Laxo"),
+])
+def test_search_finds_described_needs(index, query, expected):
+    hits = index.search(query, top_k=3)
+    assert hits and hits[0]["name"] == expected
+    assert all(h["coverage"] >= sem.MIN_COVERAGE for h in hits)
+
+
+@pytest.mark.parametrize("query", [
+    "i am feeling sad",
+    "something for acid reflux at night",
+    "hello there",
+    "medicine",
+])
+def test_search_rejects_queries_without_shared_content_terms(index, query):
+    assert index.search(query, top_k=3) == []
+
+
+def test_query_stop_words_are_not_content(index):
+    assert index.content_terms("something good for acne at night") == ["acne"]
+
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(sem.INDEX_DIR, sem.TERMS_FILE)),
+                    reason="semantic index not built (python build_semantic_index.py)")
+def test_labelled_queries_on_built_index():
+    index = sem.SemanticIndex()
+    with open(QUERIES, encoding="utf-8") as f:
+        queries = [json.loads(line) for line in f if line.strip()]
+    found = 0
+    for q in queries:
+        hits = index.search(q["query"], top_k=3)
+        if q["expect"] is None:
+            assert hits == [], q["query"]
+            continue
+        assert all(any(w in h["snippet"].lower() for w in q["expect"]) for h in hits), q["query"]
+        found += bool(hits)
+    assert found >= 0.75 * sum(q["expect"] is not None for q in queries)
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from helpers import tts_helpers as tts
+
+TIMEOUT = 5
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setenv("MEDIBOT_TTS_DRIVER", "null")
+    worker = tts.TTSWorker()
+    assert worker.enabled and isinstance(worker.engine, tts.NullEngine)
+    yield worker
+    worker.shutdown()
+
+
+def speak_and_wait(worker, text):
+    done = threading.Event()
+    worker.speak(text, done.set)
+    assert done.wait(TIMEOUT)
+
+
+def test_split_chunks_splits_sentences_and_strips_markup():
+    text = "🩺 **Predicted Disease**: Migraine\n\n- Rest well. Drink water!  Avoid screens?"
+    assert tts.split_chunks(text) == ["🩺 Predicted Disease: Migraine", "Rest well.", "Drink water!", "Avoid screens?"]
+
+
+def test_split_chunks_breaks_long_sentences_at_commas_then_spaces():
+    sentence = ", ".join(["paracetamol 500mg"] * 20) + "."
+    chunks = tts.split_chunks(sentence, max_chars=60)
+    assert all(len(c) <= 60 for c in chunks)
+    assert " ".join(chunks).replace(" ,", ",") == sentence
+    assert tts.split_chunks("x" * 130, max_chars=50) == ["x" * 50, "x" * 50, "x" * 30]
+
+
+def test_responses_are_spoken_in_fifo_order(worker):
+    worker.speak("First one. First two.")
+    worker.speak("Second.")
+    speak_and_wait(worker, "Third.")
+    assert worker.engine.spoken == ["First one.", "First two.", "Second.", "Third."]
+
+
+def test_stop_drops_remaining_chunks_and_queued_responses(worker):
+    speaking, release = threading.Event(), threading.Event()
+    say = worker.engine.say
+
+    def blocking_say(text):
+        say(text)
+        speaking.set()
+        release.wait(TIMEOUT)
+
+    worker.engine.say = blocking_say
+    finished = []
+    worker.speak("One. Two. Three.", lambda: finished.append("first"))
+    worker.speak("Queued.", lambda: finished.append("queued"))
+    assert speaking.wait(TIMEOUT)
+    worker.stop()
+    release.set()
+
+    speak_and_wait(worker, "After stop.")
+    assert worker.engine.spoken == ["One.", "After stop."]
+    # Cancelled responses still report completion, in order
+    assert finished == ["first", "queued"]
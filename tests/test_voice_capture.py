@@ -0,0 +1,79 @@
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+pytest.importorskip("soundfile")
+
+from helpers import speech_helpers as sh
+
+RATE = sh.SAMPLE_RATE
+
+
+class StubTranscriber:
+    """Stands in for TranscriptionService: answers synchronously with the audio length."""
+
+    def __init__(self, text="i have a headache"):
+        self.text = text
+        self.ready = threading.Event()
+        self.ready.set()
+        self.calls = []
+
+    def transcribe(self, audio, on_result):
+        self.calls.append(len(audio))
+        on_result(self.text, None)
+
+
+@pytest.fixture
+def utterance_wav(tmp_path):
+    """0.5 s of room noise, 2 s of 'speech' (a tone), then 2 s of room noise."""
+    rng = np.random.default_rng(0)
+    noise = lambda seconds: rng.normal(0, 0.001, int(RATE * seconds))
+    t = np.arange(int(RATE * 2)) / RATE
+    audio = np.concatenate([noise(0.5), 0.3 * np.sin(2 * np.pi * 220 * t), noise(2)])
+    path = tmp_path / "utterance.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes((np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes())
+    return path
+
+
+def test_wav_chunks_are_microphone_sized(utterance_wav):
+    chunks = list(sh.wav_chunks(utterance_wav))
+    assert all(len(c) == RATE * sh.FRAME_MS // 1000 for c in chunks)
+    assert sum(len(c) for c in chunks) == int(RATE * 4.5)
+    assert chunks[0].dtype == np.float32
+
+
+def test_capture_ends_after_trailing_silence_and_returns_final_text(utterance_wav):
+    service = StubTranscriber()
+    finals, partials, ended = [], [], []
+    capture = sh.VoiceCapture(service, on_final=lambda text, error: finals.append((text, error)),
+                              on_partial=partials.append, on_speech_end=lambda: ended.append(True))
+    chunks = sh.wav_chunks(utterance_wav)
+    consumed = 0
+    for chunk in chunks:
+        consumed += len(chunk)
+        if capture.feed(chunk):
+            break
+
+    # Endpointed roughly 0.7 s into the trailing silence, not at the end of the file
+    assert capture.done and ended == [True]
+    assert 3.0 <= consumed / RATE <= 3.4
+    assert finals == [("i have a headache", None)]
+    assert partials == ["i have a headache"]  # one partial during the 2 s of speech
+    # The final pass gets the pre-roll plus the speech, without the trailing silence
+    assert 2.0 <= service.calls[-1] / RATE <= 2.4
+
+
+def test_capture_without_speech_returns_empty_text():
+    service = StubTranscriber()
+    finals = []
+    capture = sh.VoiceCapture(service, on_final=lambda text, error: finals.append((text, error)),
+                              no_speech_timeout_ms=600)
+    sh.run_capture(capture, iter([np.zeros(RATE // 10, dtype=np.float32)] * 20))
+    assert finals == [("", None)]
+    assert service.calls == []
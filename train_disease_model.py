@@ -0,0 +1,197 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import platform
+import shutil
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.naive_bayes import BernoulliNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import LabelEncoder
+from sklearn.tree import DecisionTreeClassifier
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, "model")
+TRAINING_CSV = os.path.join(MODEL_DIR, "Training.csv")
+CACHE_DIR = os.path.join(MODEL_DIR, "cache")
+ARTIFACTS_DIR = os.path.join(MODEL_DIR, "artifacts")
+
+
+def model_families(seed):
+    return {
+        "decision_tree": DecisionTreeClassifier(random_state=seed),
+        "random_forest": RandomForestClassifier(n_estimators=100, random_state=seed),
+        "logistic_regression": LogisticRegression(max_iter=1000, random_state=seed),
+        "bernoulli_nb": BernoulliNB(),
+        "knn": KNeighborsClassifier(n_neighbors=5),
+    }
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_features(csv_path=TRAINING_CSV, use_cache=True):
+    """
+    Load the distinct rows of the symptom matrix, caching them bit-packed
+    next to the CSV. The cache is keyed by the CSV hash so edits invalidate it.
+    """
+    digest = file_digest(csv_path)
+    cache_path = os.path.join(CACHE_DIR, f"features_dedup_{digest[:16]}.npz")
+
+    if use_cache and os.path.exists(cache_path):
+        cached = np.load(cache_path, allow_pickle=False)
+        n_features = len(cached["columns"])
+        X = np.unpackbits(cached["packed"], axis=1, count=n_features)
+        return X, cached["labels"], cached["columns"].tolist(), digest
+
+    data = pd.read_csv(csv_path)
+    data = data.loc[:, ~data.columns.str.startswith("Unnamed")]
+    # Training.csv repeats each distinct row many times; with the copies in
+    # both train and test folds every model scores 100% in cross-validation
+    data = data.drop_duplicates(ignore_index=True)
+    columns = [c for c in data.columns if c != "prognosis"]
+    X = data[columns].to_numpy(dtype=np.uint8)
+    labels = data["prognosis"].astype(str).str.strip().to_numpy().astype(str)
+
+    if use_cache:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        np.savez_compressed(cache_path, packed=np.packbits(X, axis=1),
+                            labels=labels, columns=np.array(columns))
+    return X, labels, columns, digest
+
+
+def measure_latency(model, X, repeats=200):
+    """Median single-row predict latency in milliseconds."""
+    row = X.iloc[:1]  # a one-row DataFrame, as predict_helpers passes it
+    model.predict(row)  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def evaluate(name, model, X, y, folds, seed, n_jobs):
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    scores = cross_val_score(model, X, y, cv=cv, n_jobs=n_jobs)
+
+    start = time.perf_counter()
+    model.fit(X, y)
+    fit_seconds = time.perf_counter() - start
+
+    latency_ms = measure_latency(model, X)
+    size_bytes = len(pickle.dumps(model))
+    accuracy = float(scores.mean())
+    return {
+        "model": name,
+        "cv_accuracy": accuracy,
+        "cv_std": float(scores.std()),
+        "fit_seconds": fit_seconds,
+        "latency_ms": latency_ms,
+        "size_bytes": size_bytes,
+        # Lower is better: time paid per accuracy point
+        "ms_per_accuracy_point": latency_ms / max(accuracy * 100, 1e-9),
+    }
+
+
+def save_artifacts(version_dir, model, le, columns, report):
+    os.makedirs(version_dir, exist_ok=True)
+    joblib.dump(model, os.path.join(version_dir, "model.pkl"))
+    joblib.dump(le, os.path.join(version_dir, "label_encoder.pkl"))
+    joblib.dump(list(columns), os.path.join(version_dir, "X_columns.pkl"))
+    with open(os.path.join(version_dir, "metrics.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def promote(version_dir):
+    """Copy a versioned artifact set to model/, where predict_helpers loads it."""
+    for name in ("model.pkl", "label_encoder.pkl", "X_columns.pkl"):
+        shutil.copy2(os.path.join(version_dir, name), os.path.join(MODEL_DIR, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and compare disease prediction models.")
+    parser.add_argument("--models", nargs="+", help="Model families to compare (default: all)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--select", choices=["accuracy", "latency"], default="latency",
+                        help="Pick the most accurate model, or the best latency per accuracy point")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild features from the CSV")
+    parser.add_argument("--promote", action="store_true", help="Install the chosen model into model/")
+    args = parser.parse_args()
+
+    np.random.seed(args.seed)
+    X, labels, columns, digest = load_features(use_cache=not args.no_cache)
+    # Fit with feature names: predict_helpers predicts on a DataFrame with X_columns
+    X = pd.DataFrame(X, columns=columns)
+    le = LabelEncoder()
+    y = le.fit_transform(labels)
+    print(f"📊 Loaded {X.shape[0]} rows x {X.shape[1]} symptoms, {len(le.classes_)} diseases")
+
+    families = model_families(args.seed)
+    names = args.models or list(families)
+    unknown = [n for n in names if n not in families]
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(unknown)}. Choose from {', '.join(families)}")
+
+    results, fitted = [], {}
+    for name in names:
+        model = families[name]
+        result = evaluate(name, model, X, y, args.folds, args.seed, args.n_jobs)
+        results.append(result)
+        fitted[name] = model
+        print(f"  {name:<20} acc={result['cv_accuracy'] * 100:6.2f}% ±{result['cv_std'] * 100:.2f}  "
+              f"latency={result['latency_ms']:.3f}ms  size={result['size_bytes'] / 1024:.1f}KB")
+
+    if args.select == "accuracy":
+        best = max(results, key=lambda r: (r["cv_accuracy"], -r["latency_ms"]))
+    else:
+        top = max(r["cv_accuracy"] for r in results)
+        # Only consider models within one point of the best accuracy
+        eligible = [r for r in results if r["cv_accuracy"] >= top - 0.01]
+        best = min(eligible, key=lambda r: r["ms_per_accuracy_point"])
+
+    version = datetime.now().strftime("%Y%m%d_%H%M%S")
+    version_dir = os.path.join(ARTIFACTS_DIR, version)
+    report = {
+        "version": version,
+        "training_csv_sha256": digest,
+        "seed": args.seed,
+        "versions": {
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "folds": args.folds,
+        "selected": best["model"],
+        "selection": args.select,
+        "results": results,
+    }
+    save_artifacts(version_dir, fitted[best["model"]], le, columns, report)
+    print(f"✅ Selected '{best['model']}', artifacts saved in {version_dir}")
+
+    if args.promote:
+        promote(version_dir)
+        print("✅ Promoted to model/")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,92 +1,67 @@
+import os
 import pickle
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-
-# Expanded training data with varied medicine info queries
-training_data = [
-    # Greetings
-    ("hi", "greeting"), ("hello", "greeting"), ("hey", "greeting"),
-    ("good morning", "greeting"), ("good evening", "greeting"),
-    ("yo bot", "greeting"), ("hi assistant", "greeting"),
-    ("greetings", "greeting"), ("how are you", "greeting"),
-
-    # Farewells
-    ("bye", "farewell"), ("goodbye", "farewell"), ("see you", "farewell"),
-    ("take care", "farewell"), ("catch you later", "farewell"),
-    ("exit", "farewell"), ("logging out", "farewell"),
-
-    # Thanks
-    ("thank you", "thanks"), ("thanks a lot", "thanks"),
-    ("cheers", "thanks"), ("much appreciated", "thanks"),
-    ("you're great", "thanks"), ("thank you so much", "thanks"),
+import time
 
-    # Composition Queries
-    ("composition of dolo 650", "medicine_query"),
-
-    # Uses / Benefits Queries
-    ("uses of dolo 650", "medicine_query"),
-    ("what is dolo 650 used for", "medicine_query"),
-    ("benefits of azithromycin", "medicine_query"),
-
-    # Side Effects Queries
-    ("side effects of dolo 650", "medicine_query"),
-    ("what are the side effects of sinarest", "medicine_query"),
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import classification_report
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+from sklearn.pipeline import make_pipeline
 
-    # Class Queries
-    ("action class of ibuprofen", "medicine_query"),
-    ("is paracetamol herbal or chemical", "medicine_query"),
+from helpers import intent_helpers as ih
 
-    # Habit Forming Queries
-    ("is alprazolam habit forming", "medicine_query"),
-    ("is this medicine addictive", "medicine_query"),
-    ("habit forming nature of lorazepam", "medicine_query"),
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+data_path = os.path.join(BASE_DIR, "data", "intents.csv")
+model_path = os.path.join(BASE_DIR, "intent_model.pkl")
 
-    # How to Use Queries
-    ("how to use dolo 650", "medicine_query"),
 
-    # Product Info Queries
-    ("tell me about sinarest", "medicine_query"),
-    ("information about calpol", "medicine_query"),
+def build_model():
+    # Character n-grams cope with misspelt drug names and need no vocabulary,
+    # so the pickle holds only the classifier weights.
+    return make_pipeline(
+        HashingVectorizer(analyzer="char_wb", ngram_range=(2, 4), n_features=2 ** 14,
+                          alternate_sign=False),
+        CalibratedClassifierCV(LogisticRegression(max_iter=1000, C=10), method="sigmoid", cv=3, ensemble=False),
+    )
 
-    # Symptom Check
-    ("I have a fever", "symptom_check"),
-    ("I feel headache and sore throat", "symptom_check"),
-    ("I have chills and body ache", "symptom_check"),
-    ("nausea and dizziness", "symptom_check"),
-    ("my stomach hurts", "symptom_check"),
-    ("I have chest pain", "symptom_check"),
-    ("shortness of breath", "symptom_check"),
-    ("I can't sleep and I feel anxious", "symptom_check"),
-    ("I have a skin rash", "symptom_check"),
-    ("I feel dizzy", "symptom_check"),
-    ("I have a migraine", "symptom_check"),
-    ("I feel tired all the time", "symptom_check"),
-    ("I have pain in my abdomen", "symptom_check"),
-    ("I have sore muscles", "symptom_check"),
-    ("my throat hurts", "symptom_check"),
-    ("I can’t stop coughing", "symptom_check"),
-    ("I feel bloated", "symptom_check"),
-    ("I feel pressure in my head", "symptom_check"),
-    ("my legs feel numb", "symptom_check"),
-    ("my eyes are itchy", "symptom_check"),
-    ("I feel cold even in warm weather", "symptom_check"),
-    ("I can’t breathe properly", "symptom_check"),
-    ("my back hurts", "symptom_check")
-]
 
-# Prepare training data
-X = [text for text, _ in training_data]
-y = [label for _, label in training_data]
+# Load training data
+data = pd.read_csv(data_path).dropna()
+X = data["text"].str.lower().tolist()
+y = data["intent"].tolist()
 
-# Vectorization and model training
-vectorizer = TfidfVectorizer()
-X_vec = vectorizer.fit_transform(X)
-model = LogisticRegression()
-model.fit(X_vec, y)
+# Per-intent accuracy from cross-validated predictions
+cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+cv_pred = cross_val_predict(build_model(), X, y, cv=cv)
 
-# Save model and vectorizer
-model_path = "intent_model.pkl"
+# Train on everything and save
+model = build_model()
+model.fit(X, y)
 with open(model_path, "wb") as f:
-    pickle.dump((model, vectorizer), f)
+    pickle.dump(model, f)
+
+# Latency per intent: ML path, and how many phrases the keyword fast path answers instead
+timings = {}
+fast_hits = {}
+for text, intent in zip(X, y):
+    model.predict_proba([text])  # first call per text warms caches
+    start = time.perf_counter()
+    model.predict_proba([text])
+    timings.setdefault(intent, []).append(time.perf_counter() - start)
+    fast_hits[intent] = fast_hits.get(intent, 0) + bool(ih.fast_path_intent(text))
 
-model_path
+print("📊 Cross-validated per-intent report:")
+print(classification_report(y, cv_pred, zero_division=0))
+print(f"{'intent':>16}  {'cv acc':>6}  {'p50 ms':>7}  {'p95 ms':>7}  fast path")
+for intent in sorted(timings):
+    times = np.array(timings[intent]) * 1000
+    correct = [p == t for p, t in zip(cv_pred, y) if t == intent]
+    print(f"{intent:>16}  {np.mean(correct):6.2f}  {np.percentile(times, 50):7.3f}  "
+          f"{np.percentile(times, 95):7.3f}  {fast_hits[intent]}/{len(times)}")
+all_times = np.concatenate([np.array(t) for t in timings.values()]) * 1000
+print(f"⏱️ Model latency overall: p50={np.percentile(all_times, 50):.3f}ms p95={np.percentile(all_times, 95):.3f}ms")
+print(f"⚡ Keyword fast path covers {sum(fast_hits.values())}/{len(X)} training phrases")
+print(f"✅ Intent model saved to {model_path}")